@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark for the startup cost of the bioscreen module
+
+Each step is timed in a fresh Python process, as a pipeline worker or a scheduled
+command line job would run it:
+  import      import bioscreen
+  summarize   import, configure and summarize example/data.csv
+  graph       the same, followed by a graph
+The summarize step must not load matplotlib. If it does, the benchmark says so and exits
+with status 1, so the regression is noticed.
+
+python3 benchmarks/bench_import.py [repeats]
+"""
+
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+EXAMPLE = os.path.join(REPO, 'example')
+
+SETUP = """
+import sys, time
+sys.path.insert(0, %r)
+start = time.perf_counter()
+import bioscreen
+""" % REPO
+
+STEPS = {
+  'import': SETUP,
+  'summarize': SETUP + """
+expt = bioscreen.Experiment()
+expt.set_config_from_file(%r)
+expt.summarize(%r)
+""" % (os.path.join(EXAMPLE, 'data.config'), os.path.join(EXAMPLE, 'data.csv')),
+}
+STEPS['graph'] = STEPS['summarize'] + """
+import tempfile, os
+expt.graph(os.path.join(tempfile.mkdtemp(), 'data.png'))
+"""
+
+REPORT = """
+import json
+print(json.dumps({'seconds': time.perf_counter() - start, 'matplotlib': 'matplotlib' in sys.modules}))
+"""
+
+
+def run_step(code):
+  """ Run code in a new interpreter and return its timing report """
+  output = subprocess.run([sys.executable, '-c', code + REPORT], check=True, capture_output=True, text=True)
+  return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+  repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+  status = 0
+  print('%10s %12s %12s %12s' % ('step', 'median (ms)', 'min (ms)', 'matplotlib'))
+  for step, code in STEPS.items():
+    reports = [run_step(code) for i in range(repeats)]
+    seconds = [x['seconds'] for x in reports]
+    loaded = reports[-1]['matplotlib']
+    print('%10s %12.1f %12.1f %12s' % (step, statistics.median(seconds) * 1000, min(seconds) * 1000,
+      'loaded' if loaded else 'not loaded'))
+    if (step != 'graph') and loaded:
+      print('Warning. matplotlib was loaded by the %s step' % step)
+      status = 1
+  return status
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark for bioscreen.ingest() against slow file shares
+
+Synthetic exports (see synthetic.py) are written to a local directory, and every read of
+one is delayed to stand in for a slow network share. The files are then summarized:
+  sequential   one after another with Experiment.summarize(), as an ingestion loop would
+  ingest       with bioscreen.ingest(), reading concurrently and summarizing in worker processes
+The summaries of both are checked to be the same.
+
+python3 benchmarks/bench_ingest.py [files] [delay_seconds] [workers]
+"""
+
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS, '..'))
+sys.path.insert(0, BENCHMARKS)
+import bioscreen
+import synthetic
+
+
+def sequential(data_paths, config, delay):
+  """ Read and summarize the files one at a time """
+  experiments = {}
+  for data_path in data_paths:
+    time.sleep(delay)
+    expt = bioscreen.Experiment()
+    expt.configuration = config
+    expt.summarize(data_path, reader='native')
+    experiments[data_path] = expt
+  return experiments
+
+
+async def concurrent(data_paths, config, delay, workers):
+  """ Read and summarize the files with ingest() """
+  async def slow_read(data_path):
+    await asyncio.sleep(delay)
+    with open(data_path, 'rb') as data_file:
+      return data_file.read()
+
+  experiments = {}
+  async for run in bioscreen.ingest(data_paths, config, workers=workers, read=slow_read):
+    if run['error'] is not None: raise RuntimeError(run['traceback'])
+    experiments[run['data_path']] = run['experiment']
+  return experiments
+
+
+def main(files=16, delay=0.25, workers=4):
+  files, delay, workers = int(files), float(delay), int(workers)
+  with tempfile.TemporaryDirectory() as directory:
+    data_paths = []
+    for i in range(files):
+      data_paths.append(os.path.join(directory, 'unit%s.csv' % i))
+      config = synthetic.write_export(data_paths[-1], timepoints=1000, seed=i)
+    config = bioscreen.compile_configuration(config)
+    print('%s files of 200 wells x 1000 time points, %.2f s to read each, %s workers\n' % (files, delay, workers))
+
+    start = time.perf_counter()
+    expected = sequential(data_paths, config, delay)
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = asyncio.run(concurrent(data_paths, config, delay, workers))
+    ingest_time = time.perf_counter() - start
+
+    assert all([found[x].summary_data.equals(expected[x].summary_data) for x in data_paths])
+    print('%12s %10.2f s' % ('sequential', sequential_time))
+    print('%12s %10.2f s  %.1fx' % ('ingest', ingest_time, sequential_time / ingest_time))
+
+
+if __name__ == '__main__':
+  main(*sys.argv[1:4])
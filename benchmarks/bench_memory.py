@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark for the memory used by Experiment.summarize() on long runs
+
+A run of the given length, read every minute on all 200 wells of the Honeycomb plates, is
+written to a temporary UTF-16 .csv file (see synthetic.py) and summarized in each mode:
+  pandas        summarize(), as by default
+  native        summarize(reader='native')
+  float32       summarize(reader='native', dtype=np.float32)
+  keep_raw      summarize(reader='native', keep_raw=True), the raw table is kept
+  chunked       summarize(chunk_rows=1000, dtype=np.float32)
+For each, the peak memory allocated while summarizing and the memory still held by the
+Experiment afterwards are measured with tracemalloc.
+
+python3 benchmarks/bench_memory.py [days]
+"""
+
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bioscreen
+import synthetic
+
+
+MODES = [('pandas', {}),
+         ('native', {'reader': 'native'}),
+         ('float32', {'reader': 'native', 'dtype': np.float32}),
+         ('keep_raw', {'reader': 'native', 'keep_raw': True}),
+         ('chunked', {'chunk_rows': 1000, 'dtype': np.float32})]
+
+
+def measure(data_path, config, kwargs):
+  """ Peak and retained memory (bytes) and time (seconds) of summarizing data_path """
+  gc.collect()
+  tracemalloc.start()
+  start = time.perf_counter()
+  expt = bioscreen.Experiment()
+  expt.configuration = config
+  expt.summarize(data_path, **kwargs)
+  elapsed = time.perf_counter() - start
+  gc.collect()
+  retained, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  del expt
+  return peak, retained, elapsed
+
+
+def main(days=7):
+  with tempfile.TemporaryDirectory() as directory:
+    data_path = os.path.join(directory, 'run.csv')
+    rows = int(days * 24 * 60)
+    config = bioscreen.compile_configuration(synthetic.write_export(data_path, timepoints=rows, interval_minutes=1))
+    print('%s days, %s rows x 200 wells, %.1f MB file\n' % (days, rows, os.path.getsize(data_path) / 1024 ** 2))
+    print('%10s %12s %14s %10s' % ('mode', 'peak (MB)', 'retained (MB)', 'time (s)'))
+    for name, kwargs in MODES:
+      peak, retained, elapsed = measure(data_path, config, kwargs)
+      print('%10s %12.1f %14.1f %10.2f' % (name, peak / 1024 ** 2, retained / 1024 ** 2, elapsed))
+
+
+if __name__ == '__main__':
+  main(*[float(x) for x in sys.argv[1:2]])
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark suite for the Experiment pipeline
+
+Synthetic exports (see synthetic.py) are written for a sweep of sizes, and each of these
+operations is timed (best of the repeats) and its peak memory measured with tracemalloc:
+  summarize         summarize() with the pandas reader
+  summarize_native  summarize(reader='native')
+  write_text        write_summary() to a tab-delimited file
+  write_binary      write_summary() to a binary .bsum file
+  load_text         load_summary() of the tab-delimited file
+  load_binary       load_summary() of the binary file
+  graph             graph()
+  graph_groups      graph_groups()
+The sweeps are over the number of time points (200 wells) and the number of wells (at the
+middle number of time points), for .csv exports and one size of .txt export.
+
+The results are saved as JSON, along with the versions of Python, numpy, pandas and the
+git commit, so that runs of different versions can be compared:
+
+python3 benchmarks/bench_suite.py --output before.json
+python3 benchmarks/bench_suite.py --output after.json --compare before.json
+python3 benchmarks/bench_suite.py --quick --skip graph,graph_groups
+"""
+
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS, '..'))
+sys.path.insert(0, BENCHMARKS)
+import bioscreen
+import synthetic
+
+OPERATIONS = ['summarize', 'summarize_native', 'write_text', 'write_binary', 'load_text', 'load_binary',
+              'graph', 'graph_groups']
+
+SWEEPS = {'full': {'timepoints': [100, 1000, 5000, 20000], 'wells': [50, 100, 200]},
+          'quick': {'timepoints': [100, 1000], 'wells': [50, 200]}}
+
+
+def cases(sweep):
+  """ (format, wells, timepoints) of each export in a sweep """
+  timepoints = SWEEPS[sweep]['timepoints']
+  middle = timepoints[len(timepoints) // 2]
+  found = [('csv', 200, x) for x in timepoints]
+  found += [('csv', x, middle) for x in SWEEPS[sweep]['wells'] if x != 200]
+  found.append(('txt', 200, middle))
+  return found
+
+
+def measure(operation, repeats):
+  """
+  Best time of repeats calls of operation, then the peak memory of one more call.
+  Returns seconds and bytes
+  """
+  seconds = []
+  for i in range(repeats):
+    gc.collect()
+    start = time.perf_counter()
+    operation()
+    seconds.append(time.perf_counter() - start)
+  gc.collect()
+  tracemalloc.start()
+  operation()
+  peak = tracemalloc.get_traced_memory()[1]
+  tracemalloc.stop()
+  return min(seconds), peak
+
+
+def run_case(directory, format, wells, timepoints, operations, repeats):
+  """ Write the export for one case and measure each operation on it """
+  data_path = os.path.join(directory, 'run_%s_%s.%s' % (wells, timepoints, format))
+  configuration = synthetic.write_export(data_path, wells=wells, timepoints=timepoints)
+  configuration = bioscreen.compile_configuration(configuration)
+  sep = ',' if format == 'csv' else r'\s+'
+  text_path = os.path.join(directory, 'summary.tsv')
+  binary_path = os.path.join(directory, 'summary' + bioscreen.SUMMARY_EXTENSION)
+  figure_base = os.path.join(directory, 'figure')
+
+  expt = bioscreen.Experiment()
+  expt.configuration = configuration
+  expt.summarize(data_path, sep=sep)
+
+  def summarize(reader):
+    new_expt = bioscreen.Experiment()
+    new_expt.configuration = configuration
+    new_expt.summarize(data_path, sep=sep, reader=reader)
+
+  def load(path):
+    bioscreen.Experiment().load_summary(path)
+
+  steps = {'summarize': lambda: summarize('pandas'),
+           'summarize_native': lambda: summarize('native'),
+           'write_text': lambda: expt.write_summary(text_path),
+           'write_binary': lambda: expt.write_summary(binary_path),
+           'load_text': lambda: load(text_path),
+           'load_binary': lambda: load(binary_path),
+           'graph': lambda: expt.graph(figure_base + '.png'),
+           'graph_groups': lambda: expt.graph_groups(figure_base)}
+  expt.write_summary(text_path)
+  expt.write_summary(binary_path)
+
+  results = []
+  for operation in operations:
+    seconds, peak = measure(steps[operation], repeats)
+    results.append({'operation': operation, 'format': format, 'wells': wells, 'timepoints': timepoints,
+                    'file_bytes': os.path.getsize(data_path), 'seconds': seconds, 'peak_bytes': peak})
+    print('%18s %5s %6s %7s %12.2f %12.1f' % (operation, format, wells, timepoints, seconds * 1000, peak / 1024 ** 2))
+  return results
+
+
+def environment():
+  """ Versions and machine the benchmarks were run with """
+  try:
+    commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARKS, capture_output=True,
+      text=True).stdout.strip() or None
+  except OSError:
+    commit = None
+  return {'date': datetime.datetime.now().isoformat(timespec='seconds'), 'commit': commit,
+          'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+          'platform': platform.platform(), 'processor': platform.machine()}
+
+
+def compare(results, baseline_path):
+  """ Print the ratio of each time and peak to those of an earlier results file """
+  with open(baseline_path) as baseline_file:
+    baseline = json.load(baseline_file)
+  key = lambda x: (x['operation'], x['format'], x['wells'], x['timepoints'])
+  before = {key(x): x for x in baseline['results']}
+  print('\ncompared with %s (commit %s)' % (baseline_path, baseline['environment'].get('commit')))
+  print('%18s %5s %6s %7s %12s %12s' % ('operation', 'format', 'wells', 'points', 'time ratio', 'peak ratio'))
+  for result in results:
+    if key(result) not in before: continue
+    old = before[key(result)]
+    print('%18s %5s %6s %7s %11.2fx %11.2fx' % (key(result) + (result['seconds'] / old['seconds'],
+      result['peak_bytes'] / max(old['peak_bytes'], 1))))
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Benchmark the Experiment pipeline on synthetic exports')
+  parser.add_argument('-o', '--output', default='benchmark_results.json', help='JSON file for the results')
+  parser.add_argument('--quick', action='store_true', help='smaller sweep')
+  parser.add_argument('--repeats', type=int, default=3, help='timed calls of each operation (default 3)')
+  parser.add_argument('--skip', default='', help='comma-separated operations to leave out')
+  parser.add_argument('--compare', help='earlier results file to compare with')
+  args = parser.parse_args(argv)
+
+  operations = [x for x in OPERATIONS if x not in args.skip.split(',')]
+  sweep = 'quick' if args.quick else 'full'
+  results = []
+  print('%18s %5s %6s %7s %12s %12s' % ('operation', 'format', 'wells', 'points', 'time (ms)', 'peak (MB)'))
+  with tempfile.TemporaryDirectory() as directory:
+    for format, wells, timepoints in cases(sweep):
+      results.extend(run_case(directory, format, wells, timepoints, operations, args.repeats))
+
+  with open(args.output, 'w') as output_file:
+    json.dump({'environment': environment(), 'sweep': sweep, 'repeats': args.repeats, 'results': results},
+      output_file, indent=1)
+  print('\nresults written to %s' % args.output)
+  if args.compare: compare(results, args.compare)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark for the conversion of Bioscreen time stamps in Experiment.summarize()
+
+Compares bioscreen.convert_time() with the row-by-row loop that summarize() used before
+and checks that both give the same times.
+
+python3 benchmarks/bench_time.py
+"""
+
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import bioscreen
+
+
+def loop_convert_time(time_column, timepoints='hours'):
+  """ The conversion loop previously found in Experiment.summarize() """
+  new_time_column = []
+  for tm in time_column:
+    tm_spl = [int(x) for x in tm.split(':')]
+    tm_mins = tm_spl[1] + (tm_spl[2] / 60)
+    tm_hours = tm_spl[0] + (tm_mins / 60)
+    if (timepoints in ('minutes', 'min', 'mins', 'm')):
+      new_time = tm_mins + (tm_spl[0] * 60)
+    elif (timepoints in ('hours', 'hour', 'h')):
+      new_time = tm_hours
+    elif (timepoints in ('days', 'day', 'd')):
+      new_time = tm_hours / 24
+    new_time_column.append(new_time)
+  return new_time_column
+
+
+def time_stamps(hours, interval_minutes):
+  """ Time stamps for a run of the given length, read every interval_minutes """
+  seconds = np.arange(67, hours * 3600, interval_minutes * 60)
+  return ['%02d:%02d:%02d' % (s // 3600, (s % 3600) // 60, s % 60) for s in seconds]
+
+
+def main():
+  print('%8s %8s %10s %12s %12s %8s' % ('hours', 'interval', 'rows', 'loop (ms)', 'vector (ms)', 'speedup'))
+  for hours, interval in [(24, 20), (72, 5), (72, 1), (240, 1)]:
+    stamps = time_stamps(hours, interval)
+    assert np.array_equal(loop_convert_time(stamps), bioscreen.convert_time(stamps))
+    repeats = 10
+    loop_time = timeit.timeit(lambda: loop_convert_time(stamps), number=repeats) / repeats
+    vector_time = timeit.timeit(lambda: bioscreen.convert_time(stamps), number=repeats) / repeats
+    print('%8s %8s %10s %12.2f %12.2f %7.1fx' % (hours, interval, len(stamps), loop_time * 1000,
+      vector_time * 1000, loop_time / vector_time))
+
+
+if __name__ == '__main__':
+  main()
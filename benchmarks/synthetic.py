@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+"""
+Synthetic Bioscreen C exports for benchmarks
+
+Writes UTF-16 .csv or .txt files laid out like those exported by the Bioscreen C (two rows
+above the column headers, then Time, Blank and a column for each well), with logistic
+growth curves and measurement noise. The wells are laid out in groups, each with a blank
+and samples of some number of replicates, and the matching configuration can be written
+too (see Experiment.set_config_from_file).
+
+python3 benchmarks/synthetic.py run.csv --wells 200 --timepoints 2000 --config run.config
+python3 benchmarks/synthetic.py run.txt --groups 2 --samples 6 --replicates 3 --interval 5
+
+or from Python:
+configuration = synthetic.write_export('run.csv', wells=200, timepoints=2000)
+"""
+
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+
+def layout(wells=200, groups=None, samples=4, replicates=4):
+  """
+  Configuration (as for Experiment.configuration) of groups, each with a blank and samples
+  of the given number of replicates, filling the wells in order. If groups is None, as many
+  groups as fit in the wells are made. Wells left over are not configured.
+  """
+  per_group = replicates * (samples + 1)
+  if groups is None: groups = wells // per_group
+  if groups * per_group > wells:
+    raise RuntimeError('%s groups of %s wells do not fit in %s wells' % (groups, per_group, wells))
+  configuration = []
+  well = 1
+  for g in range(groups):
+    group = {'group': 'group%s' % (g + 1)}
+    for sample in ['blank'] + ['sample%s' % (x + 1) for x in range(samples)]:
+      group[sample] = list(range(well, well + replicates))
+      well += replicates
+    configuration.append(group)
+  return configuration
+
+
+def growth_curves(hours, configuration, wells=200, noise=0.005, seed=0):
+  """
+  OD readings (time points x wells) for a configuration: blanks stay at the medium OD and
+  each sample follows a logistic curve with its own rate, lag and maximum OD, varied a little
+  from well to well. Normal noise with SD noise is added to every reading.
+  """
+  rng = np.random.default_rng(seed)
+  hours = np.asarray(hours, dtype=float)[:, np.newaxis]
+  medium = np.full(wells, 0.1)
+  rate = np.zeros(wells)
+  lag = np.zeros(wells)
+  max_od = np.zeros(wells)
+  sample_wells = np.ones(wells, dtype=bool)
+  for group in configuration:
+    for sample, sample_well_list in group.items():
+      if sample == 'group': continue
+      columns = np.array(sample_well_list) - 1
+      if sample == 'blank':
+        sample_wells[columns] = False
+        continue
+      rate[columns] = rng.uniform(0.3, 1.2) * rng.normal(1, 0.03, len(columns))
+      lag[columns] = rng.uniform(1, 8) + rng.normal(0, 0.2, len(columns))
+      max_od[columns] = rng.uniform(0.6, 1.6) * rng.normal(1, 0.02, len(columns))
+  # wells that are not configured grow too, with curves of their own
+  unconfigured = sample_wells & (max_od == 0)
+  rate[unconfigured] = rng.uniform(0.3, 1.2, unconfigured.sum())
+  lag[unconfigured] = rng.uniform(1, 8, unconfigured.sum())
+  max_od[unconfigured] = rng.uniform(0.6, 1.6, unconfigured.sum())
+
+  # logistic growth from an inoculum of 1% of the maximum, with the lag as a delay
+  start = 0.01
+  growth = max_od / (1 + ((1 / start) - 1) * np.exp(-rate * (hours - lag)))
+  growth = np.where(hours < lag, max_od * start, np.maximum(growth, max_od * start))
+  od = medium + np.where(sample_wells, growth, 0)
+  od = od + rng.normal(0, noise, od.shape)
+  return np.round(od, 3)
+
+
+def time_stamps(timepoints, interval_minutes=15, first_seconds=67):
+  """ Bioscreen time stamps (HH:MM:SS, hours can go past 99) and the times in hours """
+  seconds = first_seconds + np.arange(timepoints) * int(round(interval_minutes * 60))
+  stamps = ['%02d:%02d:%02d' % (s // 3600, (s % 3600) // 60, s % 60) for s in seconds]
+  return stamps, seconds / 3600
+
+
+def write_export(data_path, wells=200, timepoints=200, interval_minutes=15, configuration=None,
+  groups=None, samples=4, replicates=4, noise=0.005, seed=0, format=None):
+  """
+  Write a synthetic Bioscreen export and return its configuration
+
+  Positional Arguments:
+  (1) path of the file to write
+
+  Key Word Arguments:
+  - wells=200
+      Number of well columns, at most 200 (the two Honeycomb plates)
+  - timepoints=200
+      Number of readings of each well
+  - interval_minutes=15
+      Time between readings
+  - configuration=None
+      Configuration list to lay out the wells. Defaults to layout(wells, groups, samples, replicates)
+  - noise=0.005
+      SD of the noise added to each reading
+  - seed=0
+      Seed of the random numbers, so the same arguments always give the same file
+  - format=None
+      'csv' (comma-separated) or 'txt' (tab-separated). Defaults to the file extension.
+  """
+  if not 1 <= wells <= 200: raise RuntimeError('Bioscreen exports have 1 to 200 wells')
+  if format is None: format = 'txt' if data_path.lower().endswith('.txt') else 'csv'
+  if format not in ('csv', 'txt'): raise RuntimeError('Format not a valid value: csv or txt')
+  if configuration is None: configuration = layout(wells, groups, samples, replicates)
+  stamps, hours = time_stamps(timepoints, interval_minutes)
+  od = growth_curves(hours, configuration, wells, noise, seed)
+  blank = np.round(0.1 + np.random.default_rng(seed + 1).normal(0, noise, timepoints), 3)
+
+  headers = ['Time', 'Blank'] + [str(x) for x in range(1, wells + 1)]
+  if format == 'csv':
+    empty = ',' + ','.join(['""'] * (len(headers) - 1))
+    lines = ['Label' + empty, 'Info' + empty, ','.join(headers)]
+    sep = ','
+  else:
+    lines = ['Label', 'Info', '\t'.join(headers)]
+    sep = '\t'
+  readings = np.column_stack([blank, od])
+  for stamp, row in zip(stamps, readings):
+    lines.append(stamp + sep + sep.join(['%.3f' % x for x in row]))
+  with open(data_path, 'wb') as data_file:
+    data_file.write(('\ufeff' + '\r\n'.join(lines) + '\r\n').encode('utf_16_le'))
+  return configuration
+
+
+def write_configuration(config_path, configuration):
+  """ Write a configuration file for Experiment.set_config_from_file() """
+  with open(config_path, 'w') as config_file:
+    for group in configuration:
+      for sample, wells in group.items():
+        if sample == 'group': continue
+        config_file.write('%s\t%s\t%s-%s\n' % (group['group'], sample, wells[0], wells[-1]))
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Write a synthetic Bioscreen C export')
+  parser.add_argument('data_path', help='file to write (.csv or .txt)')
+  parser.add_argument('--wells', type=int, default=200, help='number of wells, up to 200 (default 200)')
+  parser.add_argument('--timepoints', type=int, default=200, help='readings of each well (default 200)')
+  parser.add_argument('--interval', type=float, default=15, help='minutes between readings (default 15)')
+  parser.add_argument('--groups', type=int, help='number of groups (default: as many as fit)')
+  parser.add_argument('--samples', type=int, default=4, help='samples in each group, besides the blank (default 4)')
+  parser.add_argument('--replicates', type=int, default=4, help='wells of each sample (default 4)')
+  parser.add_argument('--noise', type=float, default=0.005, help='SD of the noise on each reading (default 0.005)')
+  parser.add_argument('--seed', type=int, default=0, help='random seed (default 0)')
+  parser.add_argument('--config', help='also write the configuration file here')
+  args = parser.parse_args(argv)
+
+  configuration = write_export(args.data_path, wells=args.wells, timepoints=args.timepoints,
+    interval_minutes=args.interval, groups=args.groups, samples=args.samples, replicates=args.replicates,
+    noise=args.noise, seed=args.seed)
+  if args.config: write_configuration(args.config, configuration)
+  print('%s: %s wells x %s time points, %.1f MB' % (args.data_path, args.wells, args.timepoints,
+    os.path.getsize(args.data_path) / 1024 ** 2))
+
+
+if __name__ == '__main__':
+  sys.exit(main())
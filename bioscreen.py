@@ -1,574 +1,3963 @@
-#!/usr/bin/env python3
-
-"""
-The bioscreen module analyzes and graphs growth curves from Bioscreen C data
-
-See example folder on GitHub for a step-by-step example and more in-depth documentation.
-
-## Basic example
-# create new Experiment object
-import bioscreen
-expt = bioscreen.Experiment()
-
-# configure the Experiment, i.e. define what each well is.
-# there are 3 options. See documentation for each for more information
-expt.set_config_from_file(config_file_path)
-expt.set_config([groups], [samples])
-expt.configuration = [{'group': 'group1', 'blank': [1,2,3,4], 'sample1': [5,6,7,8]}, {'group': 'group2', ...}, ...]
-
-# summarize/analyze the experiment
-# in this step, the readings for each set of wells is averaged at each time point
-# the blank well readings, if available, are subtracted from the sample readings
-expt.summarize()
-
-# output the summary data if desired
-expt.write_summary(summary_file)
-
-# graph the data
-expt.graph(figure_file)
-
-
-## It is also possible to create graphs from previously-made summary files
-expt = bioscreen.Experiment()
-expt.load_summary(summary_file)
-expt.graph(figure_file)
-
-
-## Instead of graphing everything at once, selected data can be graphed
-# graphing data just for "group1" and "group2"
-expt.graph(figure_file, groups_to_graph=['group1', 'group1'])
-
-# graphing just "sample1" in "group1"
-expt.graph(figure_file, samples_go_graph=['group1__sample1'])
-
-# or creating a graph for each group
-expt.graph_groups('figure_base_name')
-"""
-
-
-import re
-
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-
-
-class Experiment:
-
-  def __init__(self):
-    """
-    Experiment objects are used to analyze and graph bioscreen data.
-    The basic workflow is:
-    (1) use Experiment.set_config() or .set_config_from_file() to define the experiment configuration 
-    (2) summarize data with Experiment.summarize()
-    (3) graph data with Experiment.graph()
-
-    See documentation for the bioscreen module and for each method for more information
-    """
-    self.configuration = None
-    self.summary_data = None
-    self.data_path = None
-    self.summary_path = None
-
-
-  def status(self):
-    report = 'An Experiment object in the bioscreen module\n'
-    if self.configuration is not None:
-      report = report + '\nExperimental configuration: ' + str(self.configuration) + '\n'
-    else:
-      report = report + '\nExperimental configuration is not set.\n'
-    if self.summary_data is not None:
-      report = report + '\nData has been summarized.\n\tData File: {}\n\tSummary File: {}'.format(self.data_path, self.summary_path)
-    else:
-      report = report + '\nData has not been summarized yet.'
-    return report
-
-
-  def __str__(self):
-    return self.status()
-
-  def __repr__(self): 
-    return self.status()
-
-
-  def load_summary(self, summary_path):
-    """
-    Load summary data that was previously created by Experiment.write_summary()
-
-    Arguments:
-    (1) path to summary file.
-    """
-    self.summary_data = pd.read_table(summary_path)
-    self.summary_path = summary_path
-    summary_columns = [x for x in self.summary_data.columns if x != 'Time']
-    self.groups = []
-    for column in summary_columns:
-      curr_group = column.split('__')[0]
-      if curr_group not in self.groups: self.groups.append(curr_group)
-    self.timepoints = list(self.summary_data.Time)
-
-
-  def summarize(self, data_path, timepoints='hours', input_encoding='utf_16_le', rows_to_skip=2, sep=','):
-    """
-    Load raw bioscreen data, average across wells for each sample, subtract out blank values
-
-    Arguments:
-    (1) path to data file
-
-    - timepoints='hours'
-        Units to use for the timepoints. Accepted values are 'minutes', 'hours',
-        'days', or a list of the timepoints
-
-    - input_encoding='utf_16_le'
-
-    - rows_to_skip=2
-        Number of rows that are skipped when reading in the file.
-        .csv and .txt files from the bioscreen have 2 lines before the row containing column
-        headers.
-
-    - sep=','
-        The separator/delimiter used in the file
-        Default is ',' for .csv files
-        Set to '\s+' for .txt files
-    """
-    # make sure data configuration has already occurred
-    if self.configuration is None:
-      raise RuntimeError('Experiment must be configured prior to summarizing the data')
-
-    # load data
-    self.data_path = data_path
-    self.loaded_data = pd.read_csv(self.data_path, encoding=input_encoding, skiprows=rows_to_skip, sep=sep)
-
-    ## Deal with the time points
-    # if a list was given, make sure it is of the right length
-    if isinstance(timepoints, np.ndarray):
-      timepoints = list(timepoints)
-
-    if isinstance(timepoints, list):
-      if len(timepoints) != self.loaded_data.shape[0]:
-        raise RuntimeError('List given in timepoints argument is not of correct length. Data has length of %s, while time is of length %s'
-          % (self.loaded_data.shape[0], len(timepoints)))
-      else: self.timepoints = timepoints
-
-    # otherwise, convert the timepoints to the desired unit
-    elif isinstance(timepoints, str):
-
-      # make sure the timepoints argument can be understood
-      timepoints_possible = ['days', 'hours', 'minutes', 'd', 'h', 'm', 'min', 'mins', 'day', 'hour']
-      timepoints = timepoints.lower()
-      if timepoints not in timepoints_possible:
-        raise RuntimeError('Timepoints argument not a valid value: days, hours, or minutes')
-
-      time_column = self.loaded_data.Time
-
-      # make sure in format HH:MM:SS
-      time_format_error = 'Time values not in expected format, which is HH:MM:SS'
-      test_time = time_column[0].split(':')
-      if len(test_time) != 3: raise RuntimeError(time_format_error)
-      for tt in test_time:
-        if len(tt) != 2: raise RuntimeError(time_format_error)
-
-      # convert the time appropriately
-      new_time_column = []
-      for tm in time_column:
-        tm_spl = [int(x) for x in tm.split(':')]
-        tm_mins = tm_spl[1] + (tm_spl[2] / 60)
-        tm_hours = tm_spl[0] + (tm_mins / 60)
-        if (timepoints in ('minutes', 'min', 'mins', 'm')):
-          new_time = tm_mins + (tm_spl[0] * 60)
-        elif (timepoints in ('hours', 'hour', 'h')):
-          new_time = tm_hours
-        elif (timepoints in ('days', 'day', 'd')):
-          new_time = tm_hours / 24
-        else:
-          raise RuntimeError('Timepoints argument not a valid value: days, hours, or minutes')
-        new_time_column.append(new_time)
-
-      self.timepoints = new_time_column
-
-    # was given something weird in the timepoints argument
-    else: raise RuntimeError('The timepoints argument must be either a list or a string')
-
-
-    ## build a data frame in which the data have been blanked and averaged
-    self.summary_data = pd.DataFrame({'Time': self.timepoints})
-
-    # iterate over the groups in the experiment
-    for group in self.configuration:
-
-      # (1a) Get the mean blank reading at each time point
-      if ('blank' in group):
-        blank_columns = [str(x) for x in group['blank']]
-        blank_df = self.loaded_data.filter(blank_columns, axis=1)
-        blank_mean = blank_df.mean(axis=1)
-
-      # (1b) If no blank in the group, set up all blank readings as 0
-      else:
-        blank_mean = pd.Series([0] * self.loaded_data.shape[0])
-
-      # (2) Get the mean value for each sample in the group, subtract the blank mean value
-      group_df = pd.DataFrame()
-      for sample, columns in list(group.items()):
-        if (sample == 'group') or (sample == 'blank'): continue
-        columns = [str(x) for x in columns]
-        sample_df = self.loaded_data.filter(columns, axis=1)
-        sample_mean = sample_df.mean(axis=1)
-        sample_blanked = sample_mean - blank_mean
-        #sample_column = pd.Series([group['group']]).append(sample_blanked)
-        column_name = '%s__%s' % (group['group'], sample)
-        group_df[column_name] = sample_blanked
-
-      # (3) Add to summary_data
-      self.summary_data = pd.concat([self.summary_data, group_df], axis=1)
-
-
-  def write_summary(self, output_file):
-    """
-    Output summary data to tab-delimited file.
-    Summary data is averaged, blanked and has group and sample descriptions
-
-    Positional Arguments:
-    (1) output file path
-    """
-    self.summary_data.to_csv(output_file, sep='\t', index=False)
-    self.summary_path = output_file
-
-
-  def graph_groups(self, output_file_base, **kwargs):
-    """
-    Create a separate graph for each group.
-
-    Positional Arguments:
-    (1) base name for output files
-      '.groupname.png' will be added to the base name
-
-    See bioscreen.graph for key word arguments
-    """
-    if self.summary_data is None:
-      raise RuntimeError('Data must be summarized prior to graphing')
-
-    for group in self.groups:
-      file_name = output_file_base + '.' + group + '.png'
-      self.graph(file_name, groups_to_graph=[group], **kwargs)
-
-
-  def graph(self, output_file, size_inches=(8, 8), title=False, xlabel='Time (h)',
-    ylabel='OD600', line_colors='rainbow', legend=True, marker='o',
-    linestyle='-', markersize=3, addlabels=False, groups_to_graph=False,
-    samples_to_graph=False, **kwargs):
-    """
-    Graph the data
-
-    Positional Arguments:
-    (1) output file name (.png)
-
-    Key Word Arguments:
-    - size_inches=(8, 8)
-        width and height of figure in inches
-
-    - title=False
-        Title for the figure
-
-    - xlabel='Time (h)'
-         Label for the x axis
-
-    - ylabel='OD600'
-         Label for the y axis
-
-    - line_colors='rainbow'
-        Can be a string, with either a matplotlib colormap (see https://matplotlib.org/users/colormaps.html)
-        or a single color (e.g. 'blue') that will be used for all lines.
-        Can also be a list of colors that is equal in length to the number of samples graphed.
-
-    - legend=True
-        Add a legend to the figure.
-
-    - marker='o'
-        Marker to use for each data point. See https://matplotlib.org/api/markers_api.html
-
-    - linestyle='-'
-        Type of line to use. Use '--' for dashed line.
-
-    - markersize=3
-        Size of marker
-
-    - addlabels=False
-        If True, the sample names will be added at the end of the curves.
-
-    - groups_to_graph=False
-        To graph specific groups instead of all of the data, set to a list of the groups
-        e.g. ['LB', 'M9']
-
-    - samples_to_graph=False
-        To graph specific samples instead of all of the data, set to a list of the samples
-        e.g. ['LB__WT', 'M9-glu__WT', 'M9-rha__WT']
-
-    Other key word arguments that are recognized by matplotlib.pyplot.plot may be used.
-    """
-    if self.summary_data is None:
-      raise RuntimeError('Data must be summarized prior to graphing')
-
-    fig = plt.figure(figsize=size_inches)
-
-    # get data and labels into lists
-    y_data = [ list(self.summary_data[x]) for x in self.summary_data.columns if x != 'Time' ]
-    y_labels = [ x for x in self.summary_data.columns if x != 'Time' ]
-    x_time = list(self.summary_data['Time'])
-
-    ## prune the data and labels lists if only specific groups were asked for
-    if (groups_to_graph is not False) and (samples_to_graph is not False):
-      print('Warning. Both groups_to_graph and samples_to_graph were defined. Using samples_to_graph')
-
-    # if specific samples to graph
-    if (samples_to_graph is not False):
-      new_y_data = []
-      new_y_labels = []
-      for i in range(len(y_data)):
-        if y_labels[i] in samples_to_graph:
-          new_y_data.append(y_data[i])
-          new_y_labels.append(y_labels[i])
-      y_data = new_y_data
-      y_labels = new_y_labels
-
-      # see if all samples found
-      for sample in samples_to_graph:
-        if sample not in y_labels: print('Warning. Sample %s not found' % sample)
-
-    # if wanting to graph specific groups
-    if (groups_to_graph is not False) and (samples_to_graph is False):
-      found_groups = []
-      new_y_data = []
-      new_y_labels = []
-      for i in range(len(y_data)):
-        curr_group = y_labels[i].split('__')[0]
-        if (curr_group in groups_to_graph):
-          new_y_data.append(y_data[i])
-          new_y_labels.append(y_labels[i])
-          if curr_group not in found_groups: found_groups.append(curr_group)
-      y_data = new_y_data
-      y_labels = new_y_labels
-
-      # see if all groups found
-      for group in groups_to_graph:
-        if group not in found_groups: print('Warning. Group %s not found' % group)
-
-    # set up the colors
-    if isinstance(line_colors, str):
-      try:
-        color_map = plt.get_cmap(line_colors)
-        line_colors = color_map(np.linspace(0, 1, len(y_data)))
-      except:
-        line_colors = [ line_colors ] * len(y_data)
-
-    # graph lines
-    for i in np.arange(len(y_data)):
-      plt.plot(x_time, y_data[i], marker=marker, linestyle=linestyle, markersize=markersize,
-               color=line_colors[i], label=y_labels[i], **kwargs)
-
-    # title and axis labels
-    if title is not False: plt.title(title)
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-
-    # add labels to lines
-    if addlabels is True:
-      for i in np.arange(len(y_data)):
-        plt.text(x_time[-1], y_data[i][-1], y_labels[i], color=line_colors[i], ha='center')
-
-    # adding a legend and saving
-    if legend is True:
-      lgd = plt.legend(loc='center left', bbox_to_anchor=(1, 0.5))
-      plt.savefig(output_file, bbox_extra_artists=(lgd,), bbox_inches='tight')
-    else:
-      plt.savefig(output_file, bbox_inches='tight')
-
-    plt.cla()
-    plt.clf()
-    plt.close()
-
-
-  def set_config(self, groups, samples, replicates=4, wells=False):
-    """
-    Experiment.set_config() allows you to set the configuration by providing a list of the
-    experimental groups and a list of samples. Configuration can also be set from a file,
-    see set_config_from_file(). In either case, the end result is that self.config is set
-    to a list where each element is a dictionary representing a group/condition with keys
-    being the sample name (or "blank") and the values being a list of wells. self.config
-    can also be set directly
-  
-    Positional Arguments:
-    (1) a list of group names, e.g. ['LB', 'M9', ...]
-    (2) a list of samples
-        If of a single depth (a simple list), e.g. ['blank', 'WT', 'mutant', ...]
-        the list will be repeated for each group.
-  
-        If a list of lists, each item in the list is a group, e.g.
-        [ ['group1_blank', 'group1_WT', 'group1_mutant'], ['group2_blank', ...] ]
-  
-        *** Note that 'blank' is a keyword. If included in the list of samples, all other
-            samples in that group will be normalized to the blank samples, meaning that
-            the average blank reading at each time point is subtracted from the sample
-            readings.
-  
-    Key Word Arguments:
-    - replicates=4
-        The number of wells per sample.
-  
-    - wells=False
-        If False, the wells that correspond to each sample are figured out from
-        the list of groups, samples, and the number of replicates.
-        To give the lists explicitly, set wells to a list of well groups, e.g.
-        [ [1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12] ]
-  
-    Examples:
-    (1) Simplest scenario with two strains grown in two growth conditions in quadruplicate
-    config(['LB', 'M9'], ['blank', 'WT', 'KO'])
-     [ {'KO': [9, 10, 11, 12],
-        'WT': [5, 6, 7, 8],
-        'blank': [1, 2, 3, 4],
-        'group': 'LB'},
-       {'KO': [21, 22, 23, 24],
-        'WT': [17, 18, 19, 20],
-        'blank': [13, 14, 15, 16],
-        'group': 'M9'} ]
-  
-    (2) Experiment where the strains grown in the different conditions are not the same
-    config(['LB', 'M9'], [ ['blank', 'WT', 'KO'], ['blank', 'KO1', 'KO2', 'KO3'] ])
-     [ {'KO': [9, 10, 11, 12],
-        'WT': [5, 6, 7, 8],
-        'blank': [1, 2, 3, 4],
-        'group': 'LB'},
-       {'KO1': [17, 18, 19, 20],
-        'KO2': [21, 22, 23, 24],
-        'KO3': [25, 26, 27, 28],
-        'blank': [13, 14, 15, 16],
-        'group': 'M9'} ]
-  
-    (3) Experiment done in triplicate where a well needs to be excluded due to pipetting error
-    config(['LB', 'M9'], ['blank', 'WT', 'KO'], wells=[ [1,2,3], [4,5,6], [7,9], [10,11,12], [13,14,15], [16,17,18] ])
-      [ {'KO': [7, 9], 'WT': [4, 5, 6], 'blank': [1, 2, 3], 'group': 'LB'},
-        {'KO': [16, 17, 18], 'WT': [13, 14, 15], 'blank': [10, 11, 12], 'group': 'M9'} ]
-  
-    """
-  
-    # turn samples list into a list of lists if repeat_samples is True
-    if isinstance(samples[0], str):
-      samples_list = [samples] * len(groups)
-    elif isinstance(samples[0], list):
-      samples_list = samples
-    else:
-      raise RuntimeError('Unable to understand the samples list.')
-  
-    # the groups list length and the samples_list length should be equal at this point
-    if (len(groups) != len(samples_list)):
-      raise RuntimeError('Groups and Samples lists should be equal in length.\nGroups: %s\nSamples: %s' % (groups, samples_list))
-  
-    # figure out how many sets of well numbers are needed
-    num_well_groups = 0
-    for sample_list in samples_list:
-      for sample in sample_list: num_well_groups += 1
-  
-  
-    # create a list of lists for the well numbers as explained in the documentation
-    if wells is False:
-  
-      # create start and stop well numbers to be used to make wells list
-      replicates = int(replicates)
-      starts_max_range = (num_well_groups * replicates) + 1
-      starts = np.arange(1, starts_max_range, replicates)
-      stops_max_range = starts_max_range + replicates
-      stops = np.arange(1 + replicates, stops_max_range, replicates)
-  
-      # now populate the wells list
-      wells = []
-      for i in range(num_well_groups):
-        wells.append(list(np.arange(starts[i], stops[i])))
-  
-    # if wells list is provided, it should be length of the number of well groups
-    else:
-      if (len(wells) != num_well_groups):
-        raise RuntimeError('The length of the provided list of wells does not match the number of needed well groups.\nlen(wells): %s\nshould be %s' % (len(wells), num_well_groups))
-  
-    # now create the configuration list
-    config_list = []
-    g = 0    # keeps track of the group that we're on
-    w = 0    # keeps track of the well list that we're on
-    for group in samples_list:
-      group_dict = {'group': groups[g]}
-      for sample in group:
-        group_dict[sample] = wells[w]
-        w += 1
-      g += 1
-      config_list.append(group_dict)
-  
-    self.configuration = config_list
-    self.groups = groups
-  
-
-  def set_config_from_file(self, config_path):
-    """
-    set_config_from_file() will configure an Experiment by parsing a configuration file
-
-    The file should be tab-delimited with one row for each set of data to be graphed. For example,
-    if I grew WT or mutant cells in LB and M9 media, one set of data would be WT cells grown in LB media.
- 
-    Columns in the file are:
-    (1) Group/condition
-    (2) Sample name or "blank"
-    (3) Wells (e.g. 1-4 or 1,2,3,4)
-    """
-    groups = []
-    group_config = {} # keys = group name, values are dictionary with keys=sample, values=[wells]
-    self.config_path = config_path
-
-    # parse file, populate groups and group_config
-    with open(self.config_path, 'r') as config_file:
-      for line in config_file:
-        if line.startswith('#'): continue
-        ls = line.rstrip().split('\t')
-        if len(ls) != 3: print('Error in configuration file format on line: {}'.format(line))
-        group = rename_strict(ls[0])
-        if group.lower() == 'blank': group = 'blank'
-        sample = rename_strict(ls[1])
-        wells_notation = ls[2]
-        if '-' in wells_notation:
-          wells_spl = wells_notation.split('-')
-          wells = w(int(wells_spl[0]), int(wells_spl[1]))
-        if ',' in wells_notation:
-          wells_spl = wells_notation.split(',')
-          wells = [int(x) for x in wells_spl]
-        if group not in groups: groups.append(group)
-        if group not in group_config: group_config[group] = {sample: wells}
-        else: group_config[group][sample] = wells
-
-    # use group_config dictionary to make self.configuration dictionary
-    self.groups = groups
-    self.configuration = []
-    for group in self.groups:
-      new_group = {'group': group}
-      for sample in group_config[group]:
-        new_group[sample] = group_config[group][sample]
-      self.configuration.append(new_group)
-
-
-def w(a, b):
-  """
-  w() will return a list of consecutive integers from a to b
-  it is equivalent to list(range(a,b+1,1))
-  """
-  return list(range(a, b+1))
-
-
-def rename_strict(file_name):
-  """ 
-  rename_strict takes a file name (or just a string) and replaces all unwanted characters with
-  an underscore, then shortens the name so that there aren't two or more underscores
-  in a row
-
-  Allowed characters = A-Z, a-z, 0-9, _, -, ., /
-  """
-  scrubbed_name = re.sub('[^A-Za-z0-9_\-./]', '_', file_name.strip())
-  rm_underscores = scrubbed_name.strip('_')
-  while '__' in rm_underscores: rm_underscores = re.sub('__', '_', rm_underscores)
-  return rm_underscores
-
+#!/usr/bin/env python3
+
+"""
+The bioscreen module analyzes and graphs growth curves from Bioscreen C data
+
+See example folder on GitHub for a step-by-step example and more in-depth documentation.
+
+## Basic example
+# create new Experiment object
+import bioscreen
+expt = bioscreen.Experiment()
+
+# configure the Experiment, i.e. define what each well is.
+# there are 3 options. See documentation for each for more information
+expt.set_config_from_file(config_file_path)
+expt.set_config([groups], [samples])
+expt.configuration = [{'group': 'group1', 'blank': [1,2,3,4], 'sample1': [5,6,7,8]}, {'group': 'group2', ...}, ...]
+
+# configuration files and plate maps are compiled (and checked) once and can be reused for many runs
+config = bioscreen.compile_configuration(config_file_path)
+expt.configuration = config
+
+# summarize/analyze the experiment
+# in this step, the readings for each set of wells is averaged at each time point
+# the blank well readings, if available, are subtracted from the sample readings
+expt.summarize()
+
+# a reader built for Bioscreen exports, which finds the header row and keeps the rows above it, can be used instead of pandas.read_csv()
+expt.summarize(data_path, reader='native')
+
+# long runs use less memory with float32 readings, or when read and summarized in blocks of rows.
+# the raw readings are only kept (in expt.raw_data) if asked for
+expt.summarize(data_path, dtype=numpy.float32)
+expt.summarize(data_path, chunk_rows=1000)
+expt.summarize(data_path, keep_raw=True)
+
+# the raw readings are a wells x time points array in configuration order, so the readings
+# of a well, sample or group are views of it, without copies
+expt.raw_data.well(5)
+expt.raw_data.sample('group1', 'sample1')
+expt.raw_data.group('group1')
+
+# output the summary data if desired
+expt.write_summary(summary_file)
+
+# the time taken by each stage (read, parse_time, summarize, write and render) is kept,
+# with counts of rows, wells etc. A callback can be set to pass them on as they happen.
+print(expt.timings)
+bioscreen.set_timing_callback(lambda expt, stage, record: send_to_metrics(stage, record))
+# and BIOSCREEN_PROFILE=summarize python3 script.py profiles the first summarize() with cProfile
+
+# lag time, maximum growth rate, doubling time, max OD and area under the curve
+# for each sample (or per='well' for each well), which needs keep_raw=True
+parameters = expt.growth_parameters()
+
+# graph the data
+expt.graph(figure_file)
+
+
+## It is also possible to create graphs from previously-made summary files
+expt = bioscreen.Experiment()
+expt.load_summary(summary_file)
+expt.graph(figure_file)
+
+# summaries can also be written to a compact binary file, which loads lazily
+expt.write_summary('summary_file.bsum')
+
+
+## Instead of graphing everything at once, selected data can be graphed
+# graphing data just for "group1" and "group2"
+expt.graph(figure_file, groups_to_graph=['group1', 'group1'])
+
+# shading the standard deviation of the wells of each sample
+expt.graph(figure_file, error_bands='sd')
+
+# smoothing the curves, and graphing long runs with only 500 time points of each curve
+expt.graph(figure_file, smoothing='savgol', downsample=500, marker=None)
+
+# graphing just "sample1" in "group1"
+expt.graph(figure_file, samples_go_graph=['group1__sample1'])
+
+# or creating a graph for each group
+expt.graph_groups('figure_base_name')
+
+# or putting the graph of each group on a page of one PDF file
+expt.graph_groups('figure_base_name', pdf=True)
+
+# or writing an interactive HTML report, in which groups and samples can be shown and hidden
+expt.write_report('report.html', parameters='sample')
+
+
+## A run that is still going can be followed, summarizing only the newly added rows
+## and redrawing the graph each time new data arrives
+expt.follow(data_path, interval=60, graph_file=figure_file)
+
+
+## Summaries of many runs can be kept in an archive and searched across runs
+archive = bioscreen.RunArchive(archive_directory)
+archive.add(expt)
+curves = archive.query(group='group1', sample='sample1')
+
+# and replicate runs (plates, days) merged onto a common time grid, with the mean, SD and SEM
+# across runs, optionally normalized to a reference strain in each run
+merged = bioscreen.merge_experiments([expt1, expt2, 'summary3.bsum', ...], reference='wild_type')
+merged = archive.combine(reference='wild_type', normalize='max')
+
+
+## Many runs with the same configuration can be processed in parallel
+manifest = bioscreen.process_runs([data_path1, data_path2, ...], config_file_path, workers=4)
+
+# or read and summarized concurrently with asyncio, e.g. from several instruments' shares
+async for run in bioscreen.ingest(data_paths, config_file_path, workers=4):
+  store(run['experiment'])
+
+
+## The module can also be used from the command line, see python3 bioscreen.py --help
+python3 bioscreen.py summarize data.csv --config data.config
+"""
+
+
+import base64
+import codecs
+import concurrent.futures
+import copy
+import datetime
+import functools
+import glob
+import hashlib
+import inspect
+import io
+import itertools
+import json
+import os
+import re
+import shutil
+import struct
+import sys
+import time
+import traceback
+import types
+import warnings
+
+import pandas as pd
+import numpy as np
+
+
+# state of the timing callback and of profiling, see set_timing_callback() and _profiled()
+_instrumentation = {'callback': None, 'profiled': set()}
+
+# environment variable naming the Experiment methods to profile, see _profiled()
+PROFILE_VARIABLE = 'BIOSCREEN_PROFILE'
+
+
+def set_timing_callback(callback):
+  """
+  set_timing_callback() sets a function that is called with every stage timing as it is
+  recorded in Experiment.timings, e.g. to send it on to a metrics system. None removes it.
+
+  The callback is called with the Experiment, the stage ('read', 'parse_time', 'summarize',
+  'write' or 'render') and its record: a dictionary with the 'seconds' taken and counts for
+  the stage, such as 'rows', 'wells', 'curves', 'figures' or 'bytes'.
+  Callbacks are called in the process doing the work, so with process_runs() they must be
+  set before the worker processes are started (or use the 'timings' of the manifest).
+  """
+  _instrumentation['callback'] = callback
+
+
+def _profiled(method):
+  """
+  Decorator for Experiment methods that can be profiled. When the BIOSCREEN_PROFILE
+  environment variable names the method (e.g. BIOSCREEN_PROFILE=summarize, or a
+  comma-separated list), the first call of it is run with cProfile. The statistics are
+  written to bioscreen.METHOD.PID.prof (in the directory given by BIOSCREEN_PROFILE_DIR,
+  otherwise the working directory), for pstats or snakeviz.
+  Without the variable, the only cost is looking it up.
+  """
+  name = method.__name__
+
+  @functools.wraps(method)
+  def wrapper(*args, **kwargs):
+    requested = os.environ.get(PROFILE_VARIABLE)
+    if (not requested) or (name not in requested.split(',')) or (name in _instrumentation['profiled']):
+      return method(*args, **kwargs)
+    _instrumentation['profiled'].add(name)
+    import cProfile
+    profile = cProfile.Profile()
+    try:
+      return profile.runcall(method, *args, **kwargs)
+    finally:
+      profile_path = os.path.join(os.environ.get(PROFILE_VARIABLE + '_DIR', '.'), 'bioscreen.%s.%s.prof' % (name, os.getpid()))
+      profile.dump_stats(profile_path)
+      print('Profile of Experiment.%s written to %s' % (name, profile_path), file=sys.stderr)
+  return wrapper
+
+
+class Experiment:
+
+  def __init__(self):
+    """
+    Experiment objects are used to analyze and graph bioscreen data.
+    The basic workflow is:
+    (1) use Experiment.set_config() or .set_config_from_file() to define the experiment configuration 
+    (2) summarize data with Experiment.summarize()
+    (3) graph data with Experiment.graph()
+
+    See documentation for the bioscreen module and for each method for more information
+    """
+    self.configuration = None
+    self.summary_data = None
+    self.data_path = None
+    self.summary_path = None
+    self.summary_sd = None
+    self.summary_sem = None
+    self.well_scores = None
+    self.run_counts = None
+    self.raw_data = None
+    self.metadata = {}
+    self.timings = {}
+    self._loaded_data = None
+    self._well_index = None
+    self._incremental = None
+
+
+  def status(self):
+    report = 'An Experiment object in the bioscreen module\n'
+    if self.configuration is not None:
+      report = report + '\nExperimental configuration: ' + str(self.configuration) + '\n'
+    else:
+      report = report + '\nExperimental configuration is not set.\n'
+    if self.summary_data is not None:
+      report = report + '\nData has been summarized.\n\tData File: {}\n\tSummary File: {}'.format(self.data_path, self.summary_path)
+    else:
+      report = report + '\nData has not been summarized yet.'
+    return report
+
+
+  def __str__(self):
+    return self.status()
+
+  def __repr__(self): 
+    return self.status()
+
+
+  @property
+  def loaded_data(self):
+    """
+    The raw readings kept by summarize(keep_raw=True) as a pandas DataFrame, laid out like
+    the data file, or None. The readings themselves are in self.raw_data (see RawData).
+
+    The DataFrame is a copy of the readings, made the first time it is used and kept until
+    self.raw_data changes, so it takes as much memory again. Changes to it do not change
+    self.raw_data. For many lookups of wells or samples, self.raw_data.well() and
+    self.raw_data.sample() give views of the readings instead.
+    """
+    if self.raw_data is None:
+      self._loaded_data = None
+      return None
+    cached = getattr(self, '_loaded_data', None)
+    if (cached is None) or (cached[0] is not self.raw_data):
+      cached = self._loaded_data = (self.raw_data, self.raw_data.to_frame())
+    return cached[1]
+
+
+  @loaded_data.setter
+  def loaded_data(self, frame):
+    self.raw_data = None if frame is None else RawData.from_export(BioscreenExport.from_frame(frame, self.metadata))
+    self._loaded_data = None if frame is None else (self.raw_data, frame)
+
+
+  @property
+  def groups(self):
+    """
+    The group names, in order: those of the summary columns (group__sample) once data has been
+    summarized or loaded, otherwise those of the configuration.
+    """
+    groups = []
+    if self.summary_data is not None:
+      names = [x.split('__')[0] for x in self.summary_data.columns if x != 'Time']
+    elif self.configuration is not None:
+      names = [group['group'] for group in self.configuration]
+    else:
+      names = []
+    for name in names:
+      if name not in groups: groups.append(name)
+    return groups
+
+
+  def load_summary(self, summary_path):
+    """
+    Load summary data that was previously created by Experiment.write_summary()
+
+    Binary summary files are opened lazily with numpy.memmap: each column of
+    self.summary_data is a view of the file, and is only read from disk when it is used.
+    The configuration saved with a binary summary is restored to self.configuration.
+
+    Arguments:
+    (1) path to summary file.
+    """
+    with open(summary_path, 'rb') as summary_file:
+      is_binary = summary_file.read(len(SUMMARY_MAGIC)) == SUMMARY_MAGIC
+    self.summary_sd = None
+    self.summary_sem = None
+    self.well_scores = None
+    if is_binary:
+      self._load_binary_summary(summary_path)
+      return
+
+    self.summary_data = pd.read_table(summary_path)
+    self.summary_path = summary_path
+    self.timepoints = list(self.summary_data.Time)
+
+
+  @_profiled
+  def summarize(self, data_path, timepoints='hours', input_encoding='utf_16_le', rows_to_skip=2, sep=',',
+    reader='pandas', incremental=False, cache=None, exclude_outliers=False, outlier_threshold=3.5,
+    dtype=np.float64, keep_raw=False, chunk_rows=None, well_scores=False):
+    """
+    Load raw bioscreen data, average across wells for each sample, subtract out blank values
+
+    Arguments:
+    (1) path to data file
+
+    - timepoints='hours'
+        Units to use for the timepoints. Accepted values are 'minutes', 'hours',
+        'days', or a list of the timepoints
+
+    - input_encoding='utf_16_le'
+
+    - rows_to_skip=2
+        Number of rows that are skipped when reading in the file.
+        .csv and .txt files from the bioscreen have 2 lines before the row containing column
+        headers.
+
+    - sep=','
+        The separator/delimiter used in the file
+        Default is ',' for .csv files
+        Set to '\\s+' for .txt files. The native reader, and the chunked and incremental
+        summaries, also read .txt files with the default, as they look at the header row
+
+    - reader='pandas'
+        How the data file is read. 'pandas' reads it with pandas.read_csv().
+        'native' uses bioscreen.read_export(), which finds the header row itself
+        (rows_to_skip is not needed). Can also be a function that takes the data path
+        and the input_encoding, rows_to_skip and sep key word arguments and returns a
+        BioscreenExport or a pandas DataFrame.
+        Information from the top of the file, when available, is kept in self.metadata
+
+    - incremental=False
+        For runs that are still going. If True, the byte offset and row count of the read
+        are remembered, and the next incremental summarize() of the same file only reads the
+        rows appended since then and adds them to the end of self.summary_data. The
+        native reader is always used and timepoints must be a unit, not a list.
+        The raw readings are not kept, so exclude_outliers, well_scores, keep_raw, cache,
+        chunk_rows and a dtype other than np.float64 can not be used with it.
+        Returns the number of new rows. See also follow()
+
+    - cache=None
+        An ExportCache (or a directory for one). The parsed readings and the converted
+        time points are kept in the cache, keyed by the contents of the data file and the
+        input_encoding, rows_to_skip, sep and reader arguments. Summarizing the same file
+        again, e.g. with another configuration or time unit, then skips reading and parsing.
+
+    - exclude_outliers=False
+        If True, wells whose deviation score (see well_scores) is above outlier_threshold
+        are left out of the means, e.g. a well with a pipetting error
+
+    - outlier_threshold=3.5
+        Score above which a well is an outlier
+
+    - dtype=np.float64
+        Type the OD readings and the summaries are stored as. np.float32 halves the memory
+        they use; the means and spreads are still calculated in double precision.
+
+    - keep_raw=False
+        If True, the raw readings are kept in self.raw_data (a RawData, with a view of the
+        readings of any well, sample or group) after summarizing. They are needed by
+        growth_parameters() for each well or sample, and by RunArchive to store the raw data.
+        Otherwise they are released as soon as the summary is made.
+
+    - chunk_rows=None
+        For very long runs. If given, the data file is read and summarized this many rows
+        at a time, so the whole raw table is never held in memory. The native reader is
+        always used (rows_to_skip and reader are ignored), and as the well scores need every
+        row at once, self.well_scores is not made and outliers can not be excluded.
+
+    - well_scores=False
+        If True, self.well_scores is made: a DataFrame with a deviation score for every
+        well, the median over time of its robust z-score (distance from the median of its
+        replicates / 1.4826 MAD), and whether it was excluded. The scores take longer than
+        the summary itself, so they are otherwise only found when outliers are excluded.
+
+    Along with the means in self.summary_data, the same pass gives:
+    - self.summary_sd and self.summary_sem
+        standard deviation and standard error of the wells of each sample, laid out like
+        self.summary_data (see graph(error_bands=...))
+    - self.timings
+        the time taken by each stage: 'read', 'parse_time' and 'summarize' (see
+        set_timing_callback)
+    """
+    # make sure data configuration has already occurred
+    if self.configuration is None:
+      raise RuntimeError('Experiment must be configured prior to summarizing the data')
+
+    self.timings = {}
+    if incremental:
+      unsupported = [name for name, used in (('exclude_outliers', exclude_outliers), ('well_scores', well_scores),
+        ('keep_raw', keep_raw), ('cache', cache is not None), ('chunk_rows', chunk_rows is not None),
+        ('dtype', np.dtype(dtype) != np.float64)) if used]
+      if unsupported:
+        raise RuntimeError('%s can not be used when summarizing incrementally' % ', '.join(unsupported))
+      return self._summarize_incremental(data_path, timepoints, input_encoding, sep)
+    if chunk_rows is not None:
+      if exclude_outliers: raise RuntimeError('Outliers can not be excluded when summarizing in chunks')
+      return self._summarize_chunked(data_path, timepoints, input_encoding, sep, chunk_rows, dtype)
+
+    # load data
+    start = time.perf_counter()
+    self.data_path = data_path
+    self.raw_data = None
+    self._loaded_data = None
+    if isinstance(reader, str):
+      if reader not in READERS:
+        raise RuntimeError('Reader argument not a valid value: %s' % ', '.join(READERS))
+      reader = READERS[reader]
+    export = None
+    if cache is not None:
+      if not isinstance(cache, ExportCache): cache = ExportCache(cache)
+      cache_key = cache.key(self.data_path, input_encoding=input_encoding, rows_to_skip=rows_to_skip, sep=sep,
+        reader=reader)
+      export = cache.get(cache_key)
+    from_cache = export is not None
+    if export is None:
+      if (reader is read_export) and (cache is None):
+        export = read_export(self.data_path, input_encoding=input_encoding, sep=sep, dtype=dtype)
+      else:
+        export = reader(self.data_path, input_encoding=input_encoding, rows_to_skip=rows_to_skip, sep=sep)
+      if isinstance(export, pd.DataFrame):
+        export = BioscreenExport.from_frame(export)
+      if cache is not None: cache.put(cache_key, export, self.data_path)
+    export.od = export.od.astype(dtype, copy=False)
+    self.metadata = export.metadata
+    start = self._record_timing('read', start, rows=len(export.time), wells=len(export.columns),
+      cached=from_cache)
+
+    ## Deal with the time points
+    # if a list was given, make sure it is of the right length
+    if isinstance(timepoints, np.ndarray):
+      timepoints = list(timepoints)
+
+    if isinstance(timepoints, list):
+      if len(timepoints) != len(export.time):
+        raise RuntimeError('List given in timepoints argument is not of correct length. Data has length of %s, while time is of length %s'
+          % (len(export.time), len(timepoints)))
+      else: self.timepoints = timepoints
+
+    # otherwise, convert the timepoints to the desired unit
+    elif isinstance(timepoints, str):
+      self.timepoints = export.times(timepoints).tolist()
+
+    # was given something weird in the timepoints argument
+    else: raise RuntimeError('The timepoints argument must be either a list or a string')
+    start = self._record_timing('parse_time', start, rows=len(self.timepoints))
+
+    ## build a data frame in which the data have been blanked and averaged
+    # the configuration is compiled once into a well index, and the readings are laid out
+    # in its order, so the wells of each sample are a block of rows and all of the sample
+    # means and blank subtractions are a single reduction over the OD array
+    well_index = self._compile_configuration(export.columns)
+    raw = RawData.from_export(export, well_index, self.timepoints)
+    scores = None
+    mask = None
+    if exclude_outliers or well_scores: scores = raw.well_scores()
+    if exclude_outliers: mask = ~(scores > outlier_threshold)
+    statistics = raw.statistics(mask)
+    self.summary_data = _summary_frame(self.timepoints, statistics['mean'].astype(dtype), well_index.labels)
+    self.summary_sd = _summary_frame(self.timepoints, statistics['sd'].astype(dtype), well_index.labels)
+    self.summary_sem = _summary_frame(self.timepoints, statistics['sem'].astype(dtype), well_index.labels)
+    self.well_scores = None if scores is None else raw.score_table(scores, mask)
+    if keep_raw: self.raw_data = raw
+    self._record_timing('summarize', start, rows=len(self.timepoints), wells=int(well_index.mask.sum()),
+      curves=len(well_index.labels))
+
+
+  def _record_timing(self, stage, start, **counts):
+    """
+    Record the time since start (from time.perf_counter) and the counts of rows, wells etc.
+    for a stage in self.timings, and pass them on to the timing callback.
+    A stage that runs more than once (e.g. render, for each graph) adds up its seconds and
+    counts, and 'calls' says how many times it ran. summarize() starts self.timings over.
+    Returns the time now, to start the next stage.
+    """
+    now = time.perf_counter()
+    record = {'seconds': now - start}
+    record.update(counts)
+    total = self.timings.setdefault(stage, {'calls': 0})
+    total['calls'] += 1
+    for name, value in record.items():
+      if (name in total) and isinstance(value, (int, float)) and not isinstance(value, bool): total[name] += value
+      else: total[name] = value
+    if _instrumentation['callback'] is not None: _instrumentation['callback'](self, stage, record)
+    return now
+
+
+  def _summarize_chunked(self, data_path, timepoints, input_encoding, sep, chunk_rows, dtype):
+    """
+    summarize(chunk_rows=...): read and summarize the data file a block of rows at a time.
+    Only the summaries of each block are kept, and they are joined at the end.
+    """
+    if isinstance(timepoints, np.ndarray): timepoints = list(timepoints)
+    if isinstance(timepoints, str):
+      if TIME_UNITS.get(timepoints.lower()) is None:
+        raise RuntimeError('Timepoints argument not a valid value: days, hours, or minutes')
+    elif not isinstance(timepoints, list):
+      raise RuntimeError('The timepoints argument must be either a list or a string')
+
+    blocks = {'time': [], 'mean': [], 'sd': [], 'sem': []}
+    seconds = {'read': 0, 'parse_time': 0, 'summarize': 0}
+    start = time.perf_counter()
+    with open(data_path, 'r', encoding=input_encoding) as data_file:
+      preamble, file_sep = _read_preamble(data_file, sep)
+      columns = [x.strip('"') for x in preamble[-1].split(file_sep)][1:]
+      header = BioscreenExport([], np.empty((0, len(columns)), dtype=dtype), columns,
+        _parse_metadata(preamble[:-1], file_sep))
+      well_index = self._compile_configuration(header.columns)
+
+      while True:
+        lines = list(itertools.islice(data_file, chunk_rows))
+        if not lines: break
+        stamps, od = _parse_rows(''.join(lines), file_sep, len(columns), dtype)
+        times = [time.perf_counter()]
+        if isinstance(timepoints, str): blocks['time'].append(convert_time(stamps, timepoints))
+        else: blocks['time'].append(np.zeros(len(stamps)))
+        times.append(time.perf_counter())
+        statistics = RawData(od, columns, well_index).statistics()
+        for name in ('mean', 'sd', 'sem'): blocks[name].append(statistics[name].astype(dtype))
+        times.append(time.perf_counter())
+        seconds['read'] += times[0] - start
+        seconds['parse_time'] += times[1] - times[0]
+        seconds['summarize'] += times[2] - times[1]
+        start = times[2]
+
+    n_rows = sum([len(x) for x in blocks['time']])
+    if isinstance(timepoints, list):
+      if len(timepoints) != n_rows:
+        raise RuntimeError('List given in timepoints argument is not of correct length. Data has length of %s, while time is of length %s'
+          % (n_rows, len(timepoints)))
+      self.timepoints = timepoints
+    else:
+      self.timepoints = np.concatenate([np.zeros(0)] + blocks['time']).tolist()
+
+    empty = np.empty((0, len(well_index.labels)), dtype=dtype)
+    self.data_path = data_path
+    self.metadata = header.metadata
+    self.raw_data = None
+    self.well_scores = None
+    self.summary_data = _summary_frame(self.timepoints, np.concatenate([empty] + blocks['mean']), well_index.labels)
+    self.summary_sd = _summary_frame(self.timepoints, np.concatenate([empty] + blocks['sd']), well_index.labels)
+    self.summary_sem = _summary_frame(self.timepoints, np.concatenate([empty] + blocks['sem']), well_index.labels)
+
+    now = time.perf_counter()
+    counts = {'read': {'rows': n_rows, 'wells': len(columns), 'chunks': len(blocks['time'])},
+              'parse_time': {'rows': n_rows},
+              'summarize': {'rows': n_rows, 'wells': int(well_index.mask.sum()), 'curves': len(well_index.labels)}}
+    seconds['read'] += now - start
+    for stage in ('read', 'parse_time', 'summarize'):
+      self._record_timing(stage, now - seconds[stage], **counts[stage])
+
+
+  def _summarize_incremental(self, data_path, timepoints, input_encoding, sep):
+    """
+    summarize(incremental=True): read only the rows appended since the last read
+    """
+    if not isinstance(timepoints, str):
+      raise RuntimeError('Incremental summarizing needs the timepoints argument to be a unit: days, hours, or minutes')
+
+    # start over if the arguments or the configuration have changed, or if the file is not the
+    # one that was read before: its first bytes are different (e.g. another run was written
+    # over it) or it is shorter than what was read
+    key = (data_path, timepoints.lower(), input_encoding, sep, repr(self.configuration))
+    state = self._incremental
+    if (state is not None) and (state['key'] != key): state = None
+
+    # read everything after the last read, but only use complete lines
+    start = time.perf_counter()
+    with open(data_path, 'rb') as data_file:
+      if (state is not None) and ((os.fstat(data_file.fileno()).st_size < state['offset']) or
+        (data_file.read(len(state['head'])) != state['head'])):
+        state = None
+      offset = 0 if state is None else state['offset']
+      data_file.seek(offset)
+      data = data_file.read()
+    text = codecs.getincrementaldecoder(input_encoding)().decode(data)
+    text = text[:text.rfind('\n') + 1]
+    encoded_length = len(text.encode(input_encoding))
+    if offset > 0: encoded_length -= len(''.encode(input_encoding))    # byte order mark
+
+    if state is None:
+      lines = text.lstrip('\ufeff').splitlines()
+      try:
+        header_row, file_sep = _find_header(lines, sep)
+      except RuntimeError:
+        # the header row has not been written yet
+        return 0
+      export = parse_export(text, sep=file_sep)
+      # or the first row of readings, which is part of the bytes that tell runs apart
+      if len(export.time) == 0: return 0
+      head = ''.join(text.splitlines(True)[:header_row + 2]).encode(input_encoding)
+      well_index = self._compile_configuration(export.columns)
+      state = {'key': key, 'offset': 0, 'rows': 0, 'sep': file_sep, 'columns': export.columns,
+               'well_index': well_index, 'buffers': {}, 'head': data[:len(head)]}
+      for name in ('summary_data', 'summary_sd', 'summary_sem'):
+        state['buffers'][name] = np.empty((0, 1 + len(well_index.labels)))
+      self._incremental = state
+      self.data_path = data_path
+      self.metadata = export.metadata
+      self.raw_data = None
+      self.well_scores = None
+      self.timepoints = []
+      stamps, od = export.time, export.od
+    else:
+      stamps, od = _parse_rows(text, state['sep'], len(state['columns']))
+    state['offset'] = offset + encoded_length
+    start = self._record_timing('read', start, rows=len(stamps), wells=len(state['columns']), offset=offset)
+
+    # add the new rows to the end of the summary, SD and SEM. Each lives in a buffer that
+    # doubles in size when it is full, so each update only costs the new rows
+    new_rows = len(stamps)
+    rows = state['rows']
+    new_time = convert_time(stamps, timepoints)
+    start = self._record_timing('parse_time', start, rows=new_rows)
+    statistics = RawData(od, state['columns'], state['well_index']).statistics()
+    columns = ['Time'] + state['well_index'].labels
+    for name, statistic in (('summary_data', 'mean'), ('summary_sd', 'sd'), ('summary_sem', 'sem')):
+      values = state['buffers'][name]
+      if (rows + new_rows) > values.shape[0]:
+        values = np.empty((max(2 * values.shape[0], rows + new_rows, 64), values.shape[1]))
+        values[:rows] = state['buffers'][name][:rows]
+        state['buffers'][name] = values
+      values[rows:rows + new_rows, 0] = new_time
+      values[rows:rows + new_rows, 1:] = statistics[statistic]
+      setattr(self, name, pd.DataFrame(values[:rows + new_rows], columns=columns, copy=False))
+    state['rows'] = rows + new_rows
+    self.timepoints.extend(new_time.tolist())
+    self._record_timing('summarize', start, rows=new_rows, wells=int(state['well_index'].mask.sum()),
+      curves=len(state['well_index'].labels))
+    return new_rows
+
+
+  def follow(self, data_path, interval=60, graph_file=None, graph_kwargs=None, idle_timeout=None,
+    max_updates=None, callback=None, **kwargs):
+    """
+    Follow a run that is still going: summarize the data file as rows are added to it
+
+    The file is checked every interval seconds with summarize(incremental=True), so only
+    the new rows are read each time and self.summary_data grows as the run goes on.
+    Stops when interrupted (Ctrl-C), after max_updates checks, or when no new rows have
+    been added for idle_timeout seconds.
+
+    Positional Arguments:
+    (1) path to data file
+
+    Key Word Arguments:
+    - interval=60
+        Seconds between checks for new data
+
+    - graph_file=None
+        If given, the graph is redrawn with Experiment.graph() whenever there are new rows
+
+    - graph_kwargs=None
+        Dictionary of key word arguments for Experiment.graph()
+
+    - idle_timeout=None
+        Stop after this many seconds without new rows
+
+    - max_updates=None
+        Stop after this many checks
+
+    - callback=None
+        Function called with the Experiment and the number of new rows after each check
+        that found new rows
+
+    Other key word arguments are passed to Experiment.summarize(), e.g. timepoints='minutes'
+    """
+    updates = 0
+    last_data = time.monotonic()
+    try:
+      while True:
+        new_rows = self.summarize(data_path, incremental=True, **kwargs)
+        updates += 1
+        if new_rows > 0:
+          last_data = time.monotonic()
+          if graph_file is not None: self.graph(graph_file, **(graph_kwargs or {}))
+          if callback is not None: callback(self, new_rows)
+        if (max_updates is not None) and (updates >= max_updates): break
+        if (idle_timeout is not None) and ((time.monotonic() - last_data) >= idle_timeout): break
+        time.sleep(interval)
+    except KeyboardInterrupt:
+      pass
+
+
+  def _compile_configuration(self, columns):
+    """
+    Return a WellIndex for self.configuration and the given data columns.
+    The compiled index is kept and reused for as long as neither one changes.
+    A PlateConfiguration is checked against the columns and compiles (and caches) its own index.
+    """
+    if isinstance(self.configuration, PlateConfiguration):
+      return self.configuration.well_index(columns)
+    key = (repr(self.configuration), tuple(columns))
+    if self._well_index is None or self._well_index[0] != key:
+      self._well_index = (key, WellIndex(self.configuration, columns))
+    return self._well_index[1]
+
+
+  @_profiled
+  def write_summary(self, output_file, format=None, smoothing=False, downsample=False):
+    """
+    Output summary data to tab-delimited file.
+    Summary data is averaged, blanked and has group and sample descriptions
+
+    Positional Arguments:
+    (1) output file path
+
+    Key Word Arguments:
+    - format=None
+        'text' for the tab-delimited file, or 'binary' for a compact binary file that holds
+        the time points, the OD values as float32, the group and sample of each column and
+        the configuration. Binary files are much smaller and quicker to load (see
+        load_summary). If None, files ending in '.bsum' are binary, others are text.
+
+    - smoothing=False, downsample=False
+        Write the curves smoothed and/or downsampled, see process_curves(). Only the 'lttb'
+        downsampling method can be used, as it keeps whole rows of the summary, each at the
+        time it was read; 'minmax' gives each curve its own rows, which is only for graphs.
+    """
+    start = time.perf_counter()
+    if format is None:
+      format = 'binary' if os.fspath(output_file).endswith(SUMMARY_EXTENSION) else 'text'
+    method = (_processing_kwargs(downsample, 'downsample', 'points') or {}).get('method', 'lttb')
+    if method != 'lttb':
+      raise RuntimeError('Summaries can only be written downsampled with the lttb method, not %s' % method)
+    expt = self
+    if (smoothing is not False) or (downsample is not False):
+      expt = copy.copy(self)
+      expt.summary_data, expt.summary_sd, expt.summary_sem = self.process_curves(smoothing, downsample)
+    if format == 'binary':
+      expt._write_binary_summary(output_file)
+    elif format == 'text':
+      expt.summary_data.to_csv(output_file, sep='\t', index=False)
+    else:
+      raise RuntimeError('Format argument not a valid value: text or binary')
+    self.summary_path = output_file
+    self._record_timing('write', start, rows=len(expt.summary_data), curves=len(expt.summary_data.columns) - 1,
+      bytes=os.path.getsize(output_file))
+
+
+  def _write_binary_summary(self, output_file):
+    """
+    Write self.summary_data as a binary summary file (see _write_binary_file).
+    'time' is float64 and 'od' is float32, stored one column after another
+    (columns x time points) so that each curve can be read on its own.
+    'sd' and 'sem', when available, are stored the same way as 'od'.
+    """
+    labels = [x for x in self.summary_data.columns if x != 'Time']
+    try:
+      time_values = np.asarray(self.summary_data['Time'], dtype='<f8')
+    except (TypeError, ValueError):
+      raise RuntimeError('Binary summaries need numeric time points')
+    arrays = {'time': time_values, 'od': self.summary_data[labels].to_numpy(dtype='<f4').T}
+    if self.summary_sd is not None:
+      arrays['sd'] = self.summary_sd[labels].to_numpy(dtype='<f4').T
+      arrays['sem'] = self.summary_sem[labels].to_numpy(dtype='<f4').T
+
+    groups = []
+    for label in labels:
+      group = label.split('__')[0]
+      if group not in groups: groups.append(group)
+    header = {'version': 1,
+              'columns': labels,
+              'groups': groups,
+              'samples': [label.split('__', 1) for label in labels],
+              'configuration': self.configuration,
+              'data_path': self.data_path}
+    _write_binary_file(output_file, header, arrays)
+
+
+  def _load_binary_summary(self, summary_path):
+    """ load_summary() for binary summary files """
+    header, arrays = _open_binary_summary(summary_path)
+    self.summary_data = _memmap_frame(arrays['time'], arrays['od'], header['columns'])
+    if 'sd' in arrays:
+      self.summary_sd = _memmap_frame(arrays['time'], arrays['sd'], header['columns'])
+      self.summary_sem = _memmap_frame(arrays['time'], arrays['sem'], header['columns'])
+    self.summary_path = summary_path
+    self.timepoints = list(arrays['time'])
+    if header['configuration'] is not None: self.configuration = header['configuration']
+    if header['data_path'] is not None: self.data_path = header['data_path']
+
+
+  @_profiled
+  def growth_parameters(self, per='sample', window=5, min_od=0.01, smoothing=False):
+    """
+    Growth parameters of every well, sample or summary curve, see bioscreen.growth_parameters()
+
+    Key Word Arguments:
+    - per='sample'
+        'well' gives a row for each well, with its group's blank subtracted.
+        'sample' gives a row for each sample, with the mean and standard deviation of the
+        parameters of its wells (columns like lag_mean and lag_sd), and the number of wells.
+        'curve' gives the parameters of the averaged curves in self.summary_data. This is
+        the only option for summaries loaded with load_summary().
+
+    - window=5
+        Number of consecutive time points used for each log-OD slope
+
+    - min_od=0.01
+        Readings below this are left out of the log-OD slopes
+
+    - smoothing=False
+        Smooth each curve before the parameters are found: a smoothing method
+        ('moving_average' or 'savgol') or a dictionary of key word arguments for
+        bioscreen.smooth_curves()
+
+    Returns a pandas DataFrame with columns group, sample (and well), lag, max_rate,
+    doubling_time, max_od and auc. Times and rates are in the units of the timepoints.
+    """
+    if self.summary_data is None:
+      raise RuntimeError('Data must be summarized prior to calculating growth parameters')
+
+    if per == 'curve':
+      labels = [x for x in self.summary_data.columns if x != 'Time']
+      curves = self.summary_data[labels].to_numpy(dtype=float)
+      smoothing = _processing_kwargs(smoothing, 'smoothing', 'method')
+      if smoothing is not None: curves = smooth_curves(curves, **smoothing)
+      parameters = growth_parameters(self.timepoints, curves, window=window, min_od=min_od)
+      table = pd.DataFrame({'group': [x.split('__', 1)[0] for x in labels],
+                            'sample': [x.split('__', 1)[1] for x in labels]})
+      for name, values in parameters.items(): table[name] = values
+      return table
+
+    if per not in ('well', 'sample'):
+      raise RuntimeError('per argument not a valid value: well, sample, or curve')
+    if self.raw_data is None:
+      raise RuntimeError('Parameters for each %s need the raw data, from Experiment.summarize(keep_raw=True)' % per)
+
+    # lay the readings out again if the configuration has changed since they were summarized
+    raw = self.raw_data
+    well_index = self._compile_configuration(raw.file_columns)
+    if raw.well_index is not well_index:
+      raw = self.raw_data = RawData.from_export(raw.to_export(), well_index, raw.time)
+    curves, owners, rows = raw.well_curves()
+    smoothing = _processing_kwargs(smoothing, 'smoothing', 'method')
+    if smoothing is not None: curves = smooth_curves(curves, **smoothing)
+    parameters = growth_parameters(self.timepoints, curves, window=window, min_od=min_od)
+    labels = np.array(well_index.labels)[owners]
+    table = pd.DataFrame({'group': [x.split('__', 1)[0] for x in labels],
+                          'sample': [x.split('__', 1)[1] for x in labels],
+                          'well': [raw.columns[x] for x in rows]})
+    for name, values in parameters.items(): table[name] = values
+    if per == 'well': return table
+
+    # mean +/- SD of the wells of each sample
+    grouped = table.drop(columns='well').groupby(['group', 'sample'], sort=False)
+    sample_table = grouped.agg(['mean', 'std'])
+    sample_table.columns = ['%s_%s' % (name, stat.replace('std', 'sd')) for name, stat in sample_table.columns]
+    sample_table.insert(0, 'n_wells', grouped.size())
+    return sample_table.reset_index()
+
+
+  def process_curves(self, smoothing=False, downsample=False):
+    """
+    The summary with every curve smoothed and/or downsampled, e.g. before graphing or
+    writing it. self.summary_data is left as it is.
+
+    Key Word Arguments:
+    - smoothing=False
+        A smoothing method ('moving_average' or 'savgol'), or a dictionary of key word
+        arguments for bioscreen.smooth_curves(), e.g. {'method': 'savgol', 'window': 11}
+
+    - downsample=False
+        Number of time points to keep, or a dictionary of key word arguments for
+        bioscreen.downsample_curves(), e.g. {'points': 500, 'method': 'minmax'}.
+        The SD and SEM are taken from the same time points as the means.
+
+    Returns the processed summary_data, summary_sd and summary_sem (None if not available)
+    """
+    if self.summary_data is None:
+      raise RuntimeError('Data must be summarized prior to processing the curves')
+    smoothing = _processing_kwargs(smoothing, 'smoothing', 'method')
+    downsample = _processing_kwargs(downsample, 'downsample', 'points')
+    frames = [self.summary_data, self.summary_sd, self.summary_sem]
+    if (smoothing is None) and (downsample is None): return tuple(frames)
+
+    labels = [x for x in self.summary_data.columns if x != 'Time']
+    time = self.summary_data['Time'].to_numpy(dtype=float)
+    curves = [None if x is None else x[labels].to_numpy(dtype=float) for x in frames]
+    if smoothing is not None: curves[0] = smooth_curves(curves[0], **smoothing)
+    if downsample is not None:
+      time, rows = downsample_curves(time, curves[0], **downsample)
+      curves = [None if x is None else np.take_along_axis(x, rows, axis=0) for x in curves]
+    dtype = self.summary_data[labels].to_numpy().dtype if labels else float
+    return tuple([None if x is None else _summary_frame(time, x.astype(dtype, copy=False), labels) for x in curves])
+
+
+  @_profiled
+  def graph_groups(self, output_file_base, pdf=False, **kwargs):
+    """
+    Create a separate graph for each group.
+    One figure is drawn on and saved for every group, rather than a new figure per graph.
+
+    Positional Arguments:
+    (1) base name for output files
+      '.groupname.png' will be added to the base name
+
+    Key Word Arguments:
+    - pdf=False
+        If True, the graphs are saved as the pages of a single PDF file, output_file_base + '.pdf'
+
+    See bioscreen.graph for other key word arguments
+
+    Returns a list of the files that were written
+    """
+    if self.summary_data is None:
+      raise RuntimeError('Data must be summarized prior to graphing')
+
+    start = time.perf_counter()
+    curves = self.process_curves(kwargs.pop('smoothing', False), kwargs.pop('downsample', False))
+    figure = _new_figure(kwargs.pop('size_inches', (8, 8)))
+    groups = self.groups
+    if pdf:
+      _matplotlib()
+      from matplotlib.backends.backend_pdf import PdfPages
+      output_files = [output_file_base + '.pdf']
+      with PdfPages(output_files[0]) as pdf_pages:
+        for group in groups:
+          extra_artists = self._draw_graph(figure, curves, groups_to_graph=[group], **kwargs)
+          pdf_pages.savefig(figure, bbox_extra_artists=extra_artists, bbox_inches='tight')
+    else:
+      output_files = []
+      for group in groups:
+        file_name = output_file_base + '.' + group + '.png'
+        extra_artists = self._draw_graph(figure, curves, groups_to_graph=[group], **kwargs)
+        figure.savefig(file_name, bbox_extra_artists=extra_artists, bbox_inches='tight')
+        output_files.append(file_name)
+    self._record_timing('render', start, rows=len(curves[0]), curves=len(curves[0].columns) - 1,
+      figures=len(groups))
+    return output_files
+
+
+  @_profiled
+  def graph(self, output_file, size_inches=(8, 8), title=False, xlabel='Time (h)',
+    ylabel='OD600', line_colors='rainbow', legend=True, marker='o',
+    linestyle='-', markersize=3, addlabels=False, groups_to_graph=False,
+    samples_to_graph=False, error_bands=False, smoothing=False, downsample=False, **kwargs):
+    """
+    Graph the data
+
+    Positional Arguments:
+    (1) output file name (.png)
+
+    Key Word Arguments:
+    - size_inches=(8, 8)
+        width and height of figure in inches
+
+    - title=False
+        Title for the figure
+
+    - xlabel='Time (h)'
+         Label for the x axis
+
+    - ylabel='OD600'
+         Label for the y axis
+
+    - line_colors='rainbow'
+        Can be a string, with either a matplotlib colormap (see https://matplotlib.org/users/colormaps.html)
+        or a single color (e.g. 'blue') that will be used for all lines.
+        Can also be a list of colors that is equal in length to the number of samples graphed.
+
+    - legend=True
+        Add a legend to the figure.
+
+    - marker='o'
+        Marker to use for each data point. See https://matplotlib.org/api/markers_api.html
+
+    - linestyle='-'
+        Type of line to use. Use '--' for dashed line.
+
+    - markersize=3
+        Size of marker
+
+    - addlabels=False
+        If True, the sample names will be added at the end of the curves.
+
+    - groups_to_graph=False
+        To graph specific groups instead of all of the data, set to a list of the groups
+        e.g. ['LB', 'M9']
+
+    - samples_to_graph=False
+        To graph specific samples instead of all of the data, set to a list of the samples
+        e.g. ['LB__WT', 'M9-glu__WT', 'M9-rha__WT']
+
+    - error_bands=False
+        Set to 'sd' or 'sem' to shade the standard deviation or standard error of the wells
+        of each sample around its curve (see summarize)
+
+    - smoothing=False
+        Smooth the curves before graphing them, see process_curves()
+
+    - downsample=False
+        Graph only this many time points of each curve, see process_curves(). Long runs
+        graph faster and give smaller files, e.g. downsample=500 (or
+        {'points': 500, 'method': 'minmax'}), with marker=None.
+
+    Other key word arguments that are recognized by matplotlib.axes.Axes.plot may be used.
+    """
+    if self.summary_data is None:
+      raise RuntimeError('Data must be summarized prior to graphing')
+
+    start = time.perf_counter()
+    curves = self.process_curves(smoothing, downsample)
+    figure = _new_figure(size_inches)
+    extra_artists = self._draw_graph(figure, curves, title=title, xlabel=xlabel, ylabel=ylabel, line_colors=line_colors,
+      legend=legend, marker=marker, linestyle=linestyle, markersize=markersize, addlabels=addlabels,
+      groups_to_graph=groups_to_graph, samples_to_graph=samples_to_graph, error_bands=error_bands, **kwargs)
+    figure.savefig(output_file, bbox_extra_artists=extra_artists, bbox_inches='tight')
+    self._record_timing('render', start, rows=len(curves[0]), figures=1)
+
+
+  @_profiled
+  def write_report(self, output_file, title=False, xlabel='Time (h)', ylabel='OD600', parameters=False,
+    error_bands=False, smoothing=False, downsample=False, parameters_kwargs=None):
+    """
+    Write an interactive report: a single HTML file that graphs the curves (as SVG, drawn
+    by the browser) with check boxes to show or hide each group and sample, so that any
+    selection can be looked at without graphing again. The file is self-contained: the
+    curves are embedded in it as base64 float32 arrays, and nothing else is needed to
+    open it.
+
+    Positional Arguments:
+    (1) output file name (.html)
+
+    Key Word Arguments:
+    - title=False
+        Title for the report
+
+    - xlabel='Time (h)', ylabel='OD600'
+        Axis labels
+
+    - parameters=False
+        Set to 'sample', 'well' or 'curve' to add a table of growth parameters
+        (see growth_parameters). Rows of hidden samples are hidden too.
+
+    - error_bands=False
+        Set to 'sd' or 'sem' to shade the standard deviation or standard error of each curve
+
+    - smoothing=False, downsample=False
+        Smooth and/or downsample the curves first, see process_curves(). Downsampling keeps
+        the file small for long runs.
+
+    - parameters_kwargs=None
+        Dictionary of key word arguments for growth_parameters, e.g. {'window': 7}
+    """
+    if self.summary_data is None:
+      raise RuntimeError('Data must be summarized prior to writing a report')
+    if error_bands not in (False, 'sd', 'sem'):
+      raise RuntimeError('error_bands argument not a valid value: sd or sem')
+
+    start = time.perf_counter()
+    summary_data, summary_sd, summary_sem = self.process_curves(smoothing, downsample)
+    labels = [x for x in summary_data.columns if x != 'Time']
+    try:
+      time_values = np.asarray(summary_data['Time'], dtype='<f8')
+    except (TypeError, ValueError):
+      raise RuntimeError('Reports need numeric time points')
+    report = {'title': title or '', 'xlabel': xlabel, 'ylabel': ylabel, 'labels': labels,
+              'time': _base64_array(time_values),
+              'values': _base64_array(summary_data[labels].to_numpy(dtype='<f4').T),
+              'spread': None}
+    if error_bands is not False:
+      spread = summary_sd if error_bands == 'sd' else summary_sem
+      if spread is None:
+        raise RuntimeError('Error bands need the %s of the wells, which Experiment.summarize() calculates' % error_bands.upper())
+      report['spread'] = _base64_array(spread[labels].to_numpy(dtype='<f4').T)
+
+    table = ''
+    if parameters is not False:
+      table = _html_table(self.growth_parameters(per=parameters, **(parameters_kwargs or {})))
+    html = REPORT_TEMPLATE.replace('{{title}}', _html_escape(title or 'Bioscreen report'))
+    html = html.replace('{{parameters}}', table)
+    html = html.replace('{{data}}', json.dumps(report).replace('</', '<\\/'))
+    with open(output_file, 'w', encoding='utf-8') as report_file:
+      report_file.write(html)
+    self._record_timing('render', start, rows=len(time_values), curves=len(labels), figures=1,
+      bytes=os.path.getsize(output_file))
+
+
+  def _graph_labels(self, groups_to_graph=False, samples_to_graph=False):
+    """
+    The summary columns to graph, see graph()
+    """
+    y_labels = [ x for x in self.summary_data.columns if x != 'Time' ]
+
+    ## prune the labels list if only specific groups were asked for
+    if (groups_to_graph is not False) and (samples_to_graph is not False):
+      print('Warning. Both groups_to_graph and samples_to_graph were defined. Using samples_to_graph')
+
+    # if specific samples to graph
+    if (samples_to_graph is not False):
+      y_labels = [ x for x in y_labels if x in samples_to_graph ]
+
+      # see if all samples found
+      for sample in samples_to_graph:
+        if sample not in y_labels: print('Warning. Sample %s not found' % sample)
+
+    # if wanting to graph specific groups
+    if (groups_to_graph is not False) and (samples_to_graph is False):
+      y_labels = [ x for x in y_labels if x.split('__')[0] in groups_to_graph ]
+
+      # see if all groups found
+      found_groups = set([ x.split('__')[0] for x in y_labels ])
+      for group in groups_to_graph:
+        if group not in found_groups: print('Warning. Group %s not found' % group)
+
+    return y_labels
+
+
+  def _draw_graph(self, figure, curves, title=False, xlabel='Time (h)', ylabel='OD600', line_colors='rainbow',
+    legend=True, marker='o', linestyle='-', markersize=3, addlabels=False, groups_to_graph=False,
+    samples_to_graph=False, error_bands=False, **kwargs):
+    """
+    Clear the figure and draw the graph on it. See graph() for the key word arguments.
+    curves are the summary, SD and SEM to graph, from process_curves().
+    Returns the artists (the legend) to include when saving the figure.
+    """
+    # only the columns that will be graphed are taken from the summary, as array views
+    summary_data, summary_sd, summary_sem = curves
+    y_labels = self._graph_labels(groups_to_graph, samples_to_graph)
+    x_time = summary_data['Time'].to_numpy()
+    y_data = [ summary_data[x].to_numpy() for x in y_labels ]
+    if error_bands is not False:
+      if error_bands not in ('sd', 'sem'):
+        raise RuntimeError('error_bands argument not a valid value: sd or sem')
+      spread = summary_sd if error_bands == 'sd' else summary_sem
+      if spread is None:
+        raise RuntimeError('Error bands need the %s of the wells, which Experiment.summarize() calculates' % error_bands.upper())
+      y_spread = [ spread[x].to_numpy() for x in y_labels ]
+
+    figure.clear()
+    axes = figure.add_subplot()
+
+    # set up the colors
+    if isinstance(line_colors, str):
+      color_map = _matplotlib().colormaps.get(line_colors)
+      if color_map is not None:
+        line_colors = color_map(np.linspace(0, 1, len(y_data)))
+      else:
+        line_colors = [ line_colors ] * len(y_data)
+
+    # graph lines
+    for i in np.arange(len(y_data)):
+      axes.plot(x_time, y_data[i], marker=marker, linestyle=linestyle, markersize=markersize,
+                color=line_colors[i], label=y_labels[i], **kwargs)
+      if error_bands is not False:
+        axes.fill_between(x_time, y_data[i] - y_spread[i], y_data[i] + y_spread[i], color=line_colors[i],
+                          alpha=0.2, linewidth=0)
+
+    # title and axis labels
+    if title is not False: axes.set_title(title)
+    axes.set_xlabel(xlabel)
+    axes.set_ylabel(ylabel)
+
+    # add labels to lines
+    if addlabels is True:
+      for i in np.arange(len(y_data)):
+        axes.text(x_time[-1], y_data[i][-1], y_labels[i], color=line_colors[i], ha='center')
+
+    # adding a legend
+    if legend is True:
+      lgd = axes.legend(loc='center left', bbox_to_anchor=(1, 0.5))
+      return (lgd,)
+    return ()
+
+
+  def set_config(self, groups, samples, replicates=4, wells=False):
+    """
+    Experiment.set_config() allows you to set the configuration by providing a list of the
+    experimental groups and a list of samples. Configuration can also be set from a file,
+    see set_config_from_file(). In either case, the end result is that self.configuration is
+    set to a PlateConfiguration, which reads like a list where each element is a read-only
+    dictionary representing a group/condition with keys being the sample name (or "blank")
+    and the values being a tuple of wells. To edit it, change the list from
+    self.configuration.to_list() and assign it back: self.configuration can also be set
+    directly, to a list of dictionaries or a PlateConfiguration
+  
+    Positional Arguments:
+    (1) a list of group names, e.g. ['LB', 'M9', ...]
+    (2) a list of samples
+        If of a single depth (a simple list), e.g. ['blank', 'WT', 'mutant', ...]
+        the list will be repeated for each group.
+  
+        If a list of lists, each item in the list is a group, e.g.
+        [ ['group1_blank', 'group1_WT', 'group1_mutant'], ['group2_blank', ...] ]
+  
+        *** Note that 'blank' is a keyword. If included in the list of samples, all other
+            samples in that group will be normalized to the blank samples, meaning that
+            the average blank reading at each time point is subtracted from the sample
+            readings.
+  
+    Key Word Arguments:
+    - replicates=4
+        The number of wells per sample.
+  
+    - wells=False
+        If False, the wells that correspond to each sample are figured out from
+        the list of groups, samples, and the number of replicates.
+        To give the lists explicitly, set wells to a list of well groups, e.g.
+        [ [1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12] ]
+  
+    Examples:
+    (1) Simplest scenario with two strains grown in two growth conditions in quadruplicate
+    config(['LB', 'M9'], ['blank', 'WT', 'KO'])
+     [ {'KO': [9, 10, 11, 12],
+        'WT': [5, 6, 7, 8],
+        'blank': [1, 2, 3, 4],
+        'group': 'LB'},
+       {'KO': [21, 22, 23, 24],
+        'WT': [17, 18, 19, 20],
+        'blank': [13, 14, 15, 16],
+        'group': 'M9'} ]
+  
+    (2) Experiment where the strains grown in the different conditions are not the same
+    config(['LB', 'M9'], [ ['blank', 'WT', 'KO'], ['blank', 'KO1', 'KO2', 'KO3'] ])
+     [ {'KO': [9, 10, 11, 12],
+        'WT': [5, 6, 7, 8],
+        'blank': [1, 2, 3, 4],
+        'group': 'LB'},
+       {'KO1': [17, 18, 19, 20],
+        'KO2': [21, 22, 23, 24],
+        'KO3': [25, 26, 27, 28],
+        'blank': [13, 14, 15, 16],
+        'group': 'M9'} ]
+  
+    (3) Experiment done in triplicate where a well needs to be excluded due to pipetting error
+    config(['LB', 'M9'], ['blank', 'WT', 'KO'], wells=[ [1,2,3], [4,5,6], [7,9], [10,11,12], [13,14,15], [16,17,18] ])
+      [ {'KO': [7, 9], 'WT': [4, 5, 6], 'blank': [1, 2, 3], 'group': 'LB'},
+        {'KO': [16, 17, 18], 'WT': [13, 14, 15], 'blank': [10, 11, 12], 'group': 'M9'} ]
+  
+    """
+  
+    # turn samples list into a list of lists if repeat_samples is True
+    if isinstance(samples[0], str):
+      samples_list = [samples] * len(groups)
+    elif isinstance(samples[0], list):
+      samples_list = samples
+    else:
+      raise RuntimeError('Unable to understand the samples list.')
+  
+    # the groups list length and the samples_list length should be equal at this point
+    if (len(groups) != len(samples_list)):
+      raise RuntimeError('Groups and Samples lists should be equal in length.\nGroups: %s\nSamples: %s' % (groups, samples_list))
+  
+    # figure out how many sets of well numbers are needed
+    num_well_groups = 0
+    for sample_list in samples_list:
+      for sample in sample_list: num_well_groups += 1
+  
+  
+    # create a list of lists for the well numbers as explained in the documentation
+    if wells is False:
+  
+      # create start and stop well numbers to be used to make wells list
+      replicates = int(replicates)
+      starts_max_range = (num_well_groups * replicates) + 1
+      starts = np.arange(1, starts_max_range, replicates)
+      stops_max_range = starts_max_range + replicates
+      stops = np.arange(1 + replicates, stops_max_range, replicates)
+  
+      # now populate the wells list
+      wells = []
+      for i in range(num_well_groups):
+        wells.append(list(np.arange(starts[i], stops[i])))
+  
+    # if wells list is provided, it should be length of the number of well groups
+    else:
+      if (len(wells) != num_well_groups):
+        raise RuntimeError('The length of the provided list of wells does not match the number of needed well groups.\nlen(wells): %s\nshould be %s' % (len(wells), num_well_groups))
+  
+    # now create the configuration list
+    config_list = []
+    g = 0    # keeps track of the group that we're on
+    w = 0    # keeps track of the well list that we're on
+    for group in samples_list:
+      group_dict = {'group': groups[g]}
+      for sample in group:
+        group_dict[sample] = wells[w]
+        w += 1
+      g += 1
+      config_list.append(group_dict)
+  
+    self.configuration = PlateConfiguration(config_list)
+  
+
+  def set_config_from_file(self, config_path, layout='honeycomb'):
+    """
+    set_config_from_file() will configure an Experiment by parsing a configuration file
+
+    The file should be tab-delimited with one row for each set of data to be graphed. For example,
+    if I grew WT or mutant cells in LB and M9 media, one set of data would be WT cells grown in LB media.
+ 
+    Columns in the file are:
+    (1) Group/condition
+    (2) Sample name or "blank"
+    (3) Wells (e.g. 1-4 or 1,2,3,4, or a mix like 1-4,9)
+
+    The file can also be a plate map, a grid of group__sample names laid out like the plate.
+    See bioscreen.compile_configuration() for plate maps, layouts and the checks that are made.
+
+    Key Word Arguments:
+    - layout='honeycomb'
+        Plate layout, a key of PLATE_LAYOUTS
+    """
+    self.config_path = config_path
+    self.configuration = compile_configuration(config_path, layout=layout)
+
+
+# accepted values for the timepoints argument, and the unit each one stands for
+TIME_UNITS = {'minutes': 'minutes', 'min': 'minutes', 'mins': 'minutes', 'm': 'minutes',
+              'hours': 'hours', 'hour': 'hours', 'h': 'hours',
+              'days': 'days', 'day': 'days', 'd': 'days'}
+
+
+def convert_time(time_column, timepoints='hours'):
+  """
+  convert_time() converts a column of Bioscreen time stamps (HH:MM:SS) to minutes, hours or days
+
+  The whole column is converted at once: the time stamps are right-aligned into a fixed-width
+  array of characters, so the minutes and seconds are always found in the last columns and
+  the hours (any number of digits, so runs longer than 99 hours are fine) in the columns
+  before them.
+
+  Positional Arguments:
+  (1) list, array or Series of time stamps
+
+  Key Word Arguments:
+  - timepoints='hours'
+      Unit to convert to: 'minutes', 'hours' or 'days' (or one of the abbreviations in TIME_UNITS)
+
+  Returns a 1D float array
+  """
+  unit = TIME_UNITS.get(str(timepoints).lower())
+  if unit is None:
+    raise RuntimeError('Timepoints argument not a valid value: days, hours, or minutes')
+
+  stamps = np.char.strip(np.asarray(time_column, dtype=str))
+  if stamps.size == 0: return np.zeros(0)
+
+  # make sure in format HH:MM:SS, where the hours may have more than 2 digits
+  time_format_error = 'Time values not in expected format, which is HH:MM:SS'
+  if np.char.str_len(stamps).min() < 8: raise RuntimeError(time_format_error)
+  width = stamps.dtype.itemsize // 4    # unicode arrays use 4 bytes per character
+  characters = np.char.rjust(stamps, width, '0').view(np.uint32).reshape(len(stamps), width)
+  digits = characters.astype(np.int64) - ord('0')
+  colons = np.zeros(width, dtype=bool)
+  colons[[-6, -3]] = True
+  if (not (characters[:, colons] == ord(':')).all()) or (not ((digits[:, ~colons] >= 0) & (digits[:, ~colons] <= 9)).all()):
+    raise RuntimeError(time_format_error)
+
+  # convert the time appropriately
+  hours = (digits[:, :-6] * (10 ** np.arange(width - 7, -1, -1))).sum(axis=1).astype(float)
+  minutes = (digits[:, -5] * 10) + digits[:, -4]
+  seconds = (digits[:, -2] * 10) + digits[:, -1]
+  tm_mins = minutes + (seconds / 60)
+  if unit == 'minutes':
+    return tm_mins + (hours * 60)
+  tm_hours = hours + (tm_mins / 60)
+  if unit == 'hours':
+    return tm_hours
+  return tm_hours / 24
+
+
+def process_runs(data_paths, config, workers=None, output_dir=None, write_summary=True, graph=True,
+  graph_groups=True, parameters=False, report=False, summarize_kwargs=None, graph_kwargs=None,
+  parameters_kwargs=None, report_kwargs=None):
+  """
+  process_runs() summarizes and graphs many Bioscreen runs that share a configuration,
+  spreading the runs over a pool of worker processes.
+
+  Positional Arguments:
+  (1) list of data file paths
+  (2) the configuration: a configuration file (see Experiment.set_config_from_file), a
+      configuration list (see Experiment.set_config) or a configured Experiment.
+      It is parsed once and handed to each worker process when the worker starts.
+
+  Key Word Arguments:
+  - workers=None
+      Number of worker processes. Defaults to the number of CPUs. With workers=1 the runs
+      are processed one after another in this process.
+
+  - output_dir=None
+      Directory for the output files. Defaults to the directory of each data file.
+      Outputs are named after the data file, e.g. data.csv gives data.summary.csv,
+      data.png and data.groupname.png
+
+  - write_summary=True
+      Write the summary file (see Experiment.write_summary). Set to 'binary' for binary
+      summaries, which are named data.summary.bsum
+
+  - graph=True
+      Graph all of the data (see Experiment.graph)
+
+  - graph_groups=True
+      Create a graph for each group (see Experiment.graph_groups). Set to 'pdf' for a
+      single PDF file with a page for each group, data.pdf
+
+  - parameters=False
+      Set to 'sample', 'well' or 'curve' to write the growth parameters
+      (see Experiment.growth_parameters) to a tab-delimited file, data.parameters.csv
+
+  - report=False
+      Write an interactive HTML report (see Experiment.write_report), data.html
+
+  - summarize_kwargs=None
+      Dictionary of key word arguments for Experiment.summarize, e.g. {'timepoints': 'minutes'}
+
+  - graph_kwargs=None
+      Dictionary of key word arguments for Experiment.graph and Experiment.graph_groups
+
+  - parameters_kwargs=None
+      Dictionary of key word arguments for Experiment.growth_parameters, e.g. {'window': 7}
+
+  - report_kwargs=None
+      Dictionary of key word arguments for Experiment.write_report, e.g. {'parameters': 'sample'}
+
+  Returns the manifest, a list with a dictionary for each data file (in the order given)
+  with keys 'data_path', 'summary_path', 'figures' (list of graph files),
+  'parameters_path', 'report_path', 'error' and 'timings' (the Experiment.timings of the run).
+  A run that fails does not stop the others. Its 'error' is set to the error message and
+  its 'traceback' to the full traceback. 'error' is None for runs that succeeded.
+  """
+  configuration = _batch_configuration(config)
+  options = {'output_dir': output_dir, 'write_summary': write_summary, 'graph': graph,
+             'graph_groups': graph_groups, 'parameters': parameters, 'report': report,
+             'summarize_kwargs': summarize_kwargs or {}, 'graph_kwargs': graph_kwargs or {},
+             'parameters_kwargs': parameters_kwargs or {}, 'report_kwargs': report_kwargs or {}}
+  data_paths = list(data_paths)
+  if output_dir is not None: os.makedirs(output_dir, exist_ok=True)
+  if workers is None: workers = os.cpu_count() or 1
+  workers = max(1, min(int(workers), len(data_paths)))
+
+  if workers == 1:
+    _init_batch_worker(configuration)
+    return [_process_run(data_path, options) for data_path in data_paths]
+
+  manifest = [None] * len(data_paths)
+  with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+    initargs=(configuration,)) as executor:
+    futures = {executor.submit(_process_run, data_path, options): i for i, data_path in enumerate(data_paths)}
+    for future in concurrent.futures.as_completed(futures):
+      i = futures[future]
+      try:
+        manifest[i] = future.result()
+      except Exception as error:
+        # the worker itself failed, e.g. it was killed
+        manifest[i] = _run_record(data_paths[i])
+        manifest[i]['error'] = '%s: %s' % (type(error).__name__, error)
+        manifest[i]['traceback'] = traceback.format_exc()
+  return manifest
+
+
+def _batch_configuration(config):
+  """
+  The configuration for process_runs(). Configuration files and lists are compiled into a
+  PlateConfiguration once, which the workers then reuse for every run.
+  """
+  if isinstance(config, Experiment):
+    expt = config
+  else:
+    expt = Experiment()
+    if isinstance(config, (str, os.PathLike)): expt.set_config_from_file(config)
+    else: expt.configuration = compile_configuration(config)
+  if expt.configuration is None:
+    raise RuntimeError('Experiment must be configured prior to processing runs')
+  return expt.configuration
+
+
+# configuration shared by the runs in a process_runs() worker
+_batch = {}
+
+
+def _init_batch_worker(configuration):
+  """ Store the configuration once in each process_runs() worker """
+  _batch['configuration'] = configuration
+
+
+def _run_record(data_path):
+  """ An empty process_runs() manifest entry """
+  return {'data_path': data_path, 'summary_path': None, 'figures': [], 'parameters_path': None, 'report_path': None,
+          'error': None, 'traceback': None, 'timings': {}}
+
+
+def _process_run(data_path, options):
+  """ Summarize and graph one run in process_runs() """
+  record = _run_record(data_path)
+  expt = None
+  try:
+    output_dir = options['output_dir'] or os.path.dirname(data_path)
+    output_base = os.path.join(output_dir, os.path.splitext(os.path.basename(data_path))[0])
+
+    expt = Experiment()
+    expt.configuration = _batch['configuration']
+    summarize_kwargs = dict(options['summarize_kwargs'])
+    if (options['parameters'] in ('well', 'sample')) or \
+      (options['report'] and (options['report_kwargs'].get('parameters') in ('well', 'sample'))):
+      summarize_kwargs.setdefault('keep_raw', True)
+    expt.summarize(data_path, **summarize_kwargs)
+
+    if options['write_summary'] == 'binary':
+      expt.write_summary(output_base + '.summary' + SUMMARY_EXTENSION)
+      record['summary_path'] = expt.summary_path
+    elif options['write_summary']:
+      expt.write_summary(output_base + '.summary.csv')
+      record['summary_path'] = expt.summary_path
+    if options['parameters']:
+      table = expt.growth_parameters(per=options['parameters'], **options['parameters_kwargs'])
+      record['parameters_path'] = output_base + '.parameters.csv'
+      table.to_csv(record['parameters_path'], sep='\t', index=False)
+    if options['graph']:
+      expt.graph(output_base + '.png', **options['graph_kwargs'])
+      record['figures'].append(output_base + '.png')
+    if options['graph_groups']:
+      record['figures'].extend(expt.graph_groups(output_base, pdf=(options['graph_groups'] == 'pdf'),
+        **options['graph_kwargs']))
+    if options['report']:
+      expt.write_report(output_base + '.html', **options['report_kwargs'])
+      record['report_path'] = output_base + '.html'
+  except Exception as error:
+    record['error'] = '%s: %s' % (type(error).__name__, error)
+    record['traceback'] = traceback.format_exc()
+  if expt is not None: record['timings'] = expt.timings
+  return record
+
+
+async def ingest(data_paths, config, workers=None, max_pending=None, read=None, executor=None, **kwargs):
+  """
+  ingest() reads and summarizes many Bioscreen exports concurrently, e.g. as they arrive from
+  several instruments on network shares. It is an asynchronous generator that yields each
+  run as soon as it is summarized:
+
+  async for run in bioscreen.ingest(data_paths, config_file_path, workers=4):
+    if run['error'] is None: store(run['experiment'])
+
+  Files are read with asyncio, so a slow share only holds up its own files, and the
+  CPU-bound parsing and summarizing is done in a pool of worker processes. At most
+  max_pending files are being read, waiting for a worker, or finished but not yet taken by
+  the consumer, so reading stops when the workers or the consumer fall behind.
+
+  Positional Arguments:
+  (1) data file paths, as a list (or any iterable) or as an asynchronous iterable, e.g. of
+      files as they appear
+  (2) the configuration, as for process_runs()
+
+  Key Word Arguments:
+  - workers=None
+      Number of worker processes. Defaults to the number of CPUs.
+
+  - max_pending=None
+      Most files in progress at once. Defaults to twice the number of workers.
+
+  - read=None
+      Function that reads a data file: given the path, it returns the contents as bytes.
+      It can be a coroutine function (e.g. to add an artificial delay with asyncio.sleep,
+      or to fetch the file some other way); other functions are run in a thread.
+      Defaults to reading the file from disk in a thread.
+
+  - executor=None
+      A concurrent.futures Executor to summarize with instead of a new process pool,
+      e.g. a ThreadPoolExecutor. It is not shut down by ingest().
+
+  Other key word arguments are passed to Experiment.summarize(). The exports are always
+  parsed from the bytes read with the native parser (see read_export), so reader, cache,
+  incremental and chunk_rows can not be used.
+
+  Yields a dictionary for each file, in the order they finish, with keys 'data_path',
+  'experiment' (the summarized Experiment), 'error' and 'traceback' (None unless reading or
+  summarizing failed; a failed file does not stop the others) and 'timings'.
+  """
+  import asyncio # only needed here, and slow to import
+  for name in ('reader', 'cache', 'incremental', 'chunk_rows'):
+    if name in kwargs: raise RuntimeError('The %s argument can not be used with ingest()' % name)
+  loop = asyncio.get_running_loop()
+  configuration = _batch_configuration(config)
+  if workers is None: workers = os.cpu_count() or 1
+  if max_pending is None: max_pending = 2 * max(1, int(workers))
+  if max_pending < 1: raise RuntimeError('max_pending must be at least 1')
+  task_configuration = configuration
+  own_executor = executor is None
+  if own_executor:
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=max(1, int(workers)), initializer=_init_batch_worker,
+      initargs=(configuration,))
+    task_configuration = None
+
+  slots = asyncio.Semaphore(max_pending)
+  finished = asyncio.Queue()
+  tasks = set()
+
+  async def process(data_path):
+    record = {'data_path': data_path, 'experiment': None, 'error': None, 'traceback': None, 'timings': {}}
+    try:
+      start = time.perf_counter()
+      if read is None:
+        data = await loop.run_in_executor(None, _read_bytes, data_path)
+      elif inspect.iscoroutinefunction(read):
+        data = await read(data_path)
+      else:
+        data = await loop.run_in_executor(None, read, data_path)
+      fetch_seconds = time.perf_counter() - start
+      expt = await loop.run_in_executor(executor, _ingest_summarize, data_path, data, task_configuration, kwargs)
+      expt.timings['fetch'] = {'calls': 1, 'seconds': fetch_seconds, 'bytes': len(data)}
+      record['experiment'] = expt
+      record['timings'] = expt.timings
+    except Exception as error:
+      record['error'] = '%s: %s' % (type(error).__name__, error)
+      record['traceback'] = traceback.format_exc()
+    await finished.put(record)
+
+  async def feed():
+    async def start(data_path):
+      await slots.acquire()
+      tasks.add(loop.create_task(process(data_path)))
+    # the end is always signalled, so that an error from data_paths (e.g. a watched share that
+    # goes away) reaches the consumer, after the files already started have been yielded
+    try:
+      try:
+        if hasattr(data_paths, '__aiter__'):
+          async for data_path in data_paths: await start(data_path)
+        else:
+          for data_path in data_paths: await start(data_path)
+      except Exception:
+        await asyncio.gather(*tasks)
+        raise
+      await asyncio.gather(*tasks)
+    finally:
+      finished.put_nowait(None)
+
+  feeder = loop.create_task(feed())
+  try:
+    while True:
+      record = await finished.get()
+      if record is None: break
+      slots.release()
+      yield record
+    await feeder
+  finally:
+    for task in list(tasks) + [feeder]: task.cancel()
+    if own_executor: executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _read_bytes(data_path):
+  """ The contents of a file, for ingest() """
+  with open(data_path, 'rb') as data_file:
+    return data_file.read()
+
+
+def _ingest_summarize(data_path, data, task_configuration, kwargs):
+  """
+  Parse and summarize the contents of a data file in an ingest() worker. The configuration
+  comes with the task, or from the worker's process_runs() state when it is None.
+  """
+  configuration = _batch['configuration'] if task_configuration is None else task_configuration
+  export = parse_export(data, input_encoding=kwargs.get('input_encoding', 'utf_16_le'), sep=kwargs.get('sep'),
+    dtype=kwargs.get('dtype', np.float64))
+  expt = Experiment()
+  expt.configuration = configuration
+  expt.summarize(data_path, reader=lambda *args, **reader_kwargs: export, **kwargs)
+  return expt
+
+
+# first bytes and file extension of binary summary files, see Experiment.write_summary()
+SUMMARY_MAGIC = b'BIOSCRN\x01'
+SUMMARY_EXTENSION = '.bsum'
+
+
+def _write_binary_file(output_file, header, arrays):
+  """
+  Write arrays to a binary summary file, which has this layout:
+  (1) SUMMARY_MAGIC
+  (2) length of the header, unsigned 64 bit little endian
+  (3) JSON header, padded with spaces so that the data start on a 64 byte boundary.
+      header['arrays'] gives the dtype, shape and offset of each array.
+  (4) the arrays (C order), each at its offset from the start of the data, 8 byte aligned
+  """
+  layout = {}
+  offset = 0
+  for name, values in arrays.items():
+    layout[name] = {'offset': offset, 'dtype': values.dtype.str, 'shape': list(values.shape)}
+    offset += values.nbytes + (-values.nbytes % 8)
+  header = dict(header, arrays=layout)
+  header = json.dumps(header, default=_json_default).encode('utf-8')
+  header += b' ' * (-(len(SUMMARY_MAGIC) + 8 + len(header)) % 64)
+
+  with open(output_file, 'wb') as summary_file:
+    summary_file.write(SUMMARY_MAGIC)
+    summary_file.write(struct.pack('<Q', len(header)))
+    summary_file.write(header)
+    for values in arrays.values():
+      summary_file.write(np.ascontiguousarray(values).tobytes())
+      summary_file.write(b'\0' * (-values.nbytes % 8))
+
+
+def _open_binary_summary(summary_path):
+  """
+  Read the header of a binary summary file and memory-map its arrays (copy-on-write, so
+  changes are never written back to the file). Returns the header and a dictionary of arrays.
+  """
+  with open(summary_path, 'rb') as summary_file:
+    if summary_file.read(len(SUMMARY_MAGIC)) != SUMMARY_MAGIC:
+      raise RuntimeError('Not a binary summary file: %s' % summary_path)
+    header_length = struct.unpack('<Q', summary_file.read(8))[0]
+    header = json.loads(summary_file.read(header_length).decode('utf-8'))
+  data_offset = len(SUMMARY_MAGIC) + 8 + header_length
+  arrays = {}
+  for name, layout in header['arrays'].items():
+    if 0 in layout['shape']:
+      arrays[name] = np.zeros(layout['shape'], dtype=layout['dtype'])
+    else:
+      arrays[name] = np.memmap(summary_path, dtype=layout['dtype'], mode='c',
+        offset=data_offset + layout['offset'], shape=tuple(layout['shape']))
+  return header, arrays
+
+
+def _memmap_frame(time_values, values, labels):
+  """ A summary DataFrame whose columns are views of memory-mapped arrays (labels x time points) """
+  columns = {'Time': time_values}
+  for i, label in enumerate(labels): columns[label] = values[i]
+  return pd.DataFrame(columns, copy=False)
+
+
+def _json_default(value):
+  """ Convert numpy numbers (e.g. well numbers from set_config) and configurations for json.dumps() """
+  if isinstance(value, PlateConfiguration): return value.to_list()
+  if isinstance(value, np.generic): return value.item()
+  if isinstance(value, np.ndarray): return value.tolist()
+  raise TypeError('%s is not JSON serializable' % type(value).__name__)
+
+
+# columns of the RunArchive index, one row for each summarized curve
+ARCHIVE_INDEX_COLUMNS = ['run_id', 'date', 'data_path', 'group', 'sample', 'column', 'raw']
+
+
+class RunArchive:
+
+  def __init__(self, root):
+    """
+    A RunArchive keeps the summaries of many Bioscreen runs in one directory, with an index
+    of every curve by group, sample, date and data file, so that curves can be found across
+    experiments without loading every run.
+
+    Each run is stored as a binary summary (see Experiment.write_summary) and, when the raw
+    data is available (Experiment.summarize(keep_raw=True)), a binary copy of the raw readings so that it can be summarized again
+    with another configuration without reading the original export. Adding a run only
+    appends to the index.
+
+    Directory layout:
+      index.tsv            tab-delimited index, one row per curve (ARCHIVE_INDEX_COLUMNS)
+      runs/RUN.bsum        summary of each run
+      runs/RUN.raw.bsum    raw readings of each run (float32)
+
+    Positional Arguments:
+    (1) archive directory. It is created if it does not exist.
+
+    Example:
+    archive = bioscreen.RunArchive('archive')
+    archive.add(expt, date='2020-01-31')
+    curves = archive.query(group='M9-glucose', sample='Strain3')
+    """
+    self.root = root
+    self.index_path = os.path.join(root, 'index.tsv')
+    os.makedirs(os.path.join(root, 'runs'), exist_ok=True)
+    if os.path.exists(self.index_path):
+      self.index = pd.read_table(self.index_path, dtype=str, keep_default_na=False)
+      self.index['column'] = self.index['column'].astype(int)
+    else:
+      self.index = pd.DataFrame({x: pd.Series(dtype=int if x == 'column' else str) for x in ARCHIVE_INDEX_COLUMNS})
+
+
+  def __len__(self):
+    return len(self.run_ids())
+
+
+  def __repr__(self):
+    return 'A RunArchive in the bioscreen module\n\tDirectory: {}\n\tRuns: {}\n\tCurves: {}'.format(
+      self.root, len(self), len(self.index))
+
+
+  def run_ids(self):
+    """ The runs in the archive, in the order they were added """
+    return list(pd.unique(self.index['run_id']))
+
+
+  def runs(self):
+    """ A DataFrame with the run_id, date, data_path and raw availability of each run """
+    return self.index.drop_duplicates('run_id')[['run_id', 'date', 'data_path', 'raw']].reset_index(drop=True)
+
+
+  def summary_file(self, run_id):
+    """ Path of the binary summary file of a run """
+    return os.path.join(self.root, 'runs', run_id + SUMMARY_EXTENSION)
+
+
+  def raw_file(self, run_id):
+    """ Path of the raw readings file of a run """
+    return os.path.join(self.root, 'runs', run_id + '.raw' + SUMMARY_EXTENSION)
+
+
+  def add(self, expt, run_id=None, date=None, replace=False):
+    """
+    Add a summarized Experiment to the archive
+
+    Positional Arguments:
+    (1) an Experiment, after Experiment.summarize() (or load_summary())
+
+    Key Word Arguments:
+    - run_id=None
+        Name for the run. Defaults to the data file name, with a number added if a run
+        with that name is already in the archive.
+
+    - date=None
+        Date of the run as YYYY-MM-DD (or a datetime.date). Defaults to the date the data
+        file was last modified, or today if it cannot be found.
+
+    - replace=False
+        If True, a run with the same run_id is replaced instead of being kept
+
+    Returns the run_id
+    """
+    if expt.summary_data is None:
+      raise RuntimeError('Data must be summarized prior to archiving')
+
+    if run_id is None:
+      run_id = rename_strict(os.path.splitext(os.path.basename(expt.data_path or 'run'))[0]) or 'run'
+      if not replace:
+        base_id = run_id
+        copy_number = 1
+        while run_id in self.run_ids():
+          copy_number += 1
+          run_id = '%s_%s' % (base_id, copy_number)
+    elif rename_strict(run_id) != run_id or '/' in run_id:
+      raise RuntimeError('run_id may only contain A-Z, a-z, 0-9, _, - and .: %s' % run_id)
+    if run_id in self.run_ids():
+      if not replace: raise RuntimeError('Run %s is already in the archive' % run_id)
+      self.remove(run_id)
+
+    if date is None:
+      if expt.data_path is not None and os.path.exists(str(expt.data_path)):
+        date = datetime.date.fromtimestamp(os.path.getmtime(expt.data_path))
+      else:
+        date = datetime.date.today()
+    date = str(date)[:10]
+
+    expt._write_binary_summary(self.summary_file(run_id))
+    has_raw = getattr(expt, 'raw_data', None) is not None
+    if has_raw:
+      export = expt.raw_data.to_export()
+      _write_binary_file(self.raw_file(run_id), {'columns': export.columns, 'metadata': export.metadata},
+        {'time': export.time.astype('S'), 'od': export.od.astype('<f4').T})
+
+    labels = [x for x in expt.summary_data.columns if x != 'Time']
+    rows = pd.DataFrame({'run_id': run_id,
+                         'date': date,
+                         'data_path': '' if expt.data_path is None else os.path.abspath(str(expt.data_path)),
+                         'group': [x.split('__', 1)[0] for x in labels],
+                         'sample': [x.split('__', 1)[1] for x in labels],
+                         'column': np.arange(len(labels)),
+                         'raw': 'yes' if has_raw else 'no'}, columns=ARCHIVE_INDEX_COLUMNS)
+    write_header = not os.path.exists(self.index_path)
+    rows.to_csv(self.index_path, sep='\t', index=False, header=write_header, mode='a')
+    self.index = pd.concat([self.index, rows], ignore_index=True)
+    return run_id
+
+
+  def add_file(self, data_path, config, run_id=None, date=None, replace=False, **kwargs):
+    """
+    Summarize a data file and add it to the archive
+
+    Positional Arguments:
+    (1) path to data file
+    (2) the configuration: a configuration file, a configuration list or a configured Experiment
+
+    Key word arguments run_id, date and replace are used as in add(), others are passed
+    to Experiment.summarize(). The raw data are kept unless keep_raw=False is given.
+    Returns the run_id
+    """
+    configuration = _batch_configuration(config)
+    expt = Experiment()
+    expt.configuration = configuration
+    kwargs.setdefault('keep_raw', True)
+    expt.summarize(data_path, **kwargs)
+    return self.add(expt, run_id=run_id, date=date, replace=replace)
+
+
+  def remove(self, run_id):
+    """ Remove a run from the archive """
+    if run_id not in self.run_ids(): raise RuntimeError('Run %s is not in the archive' % run_id)
+    for file_path in (self.summary_file(run_id), self.raw_file(run_id)):
+      if os.path.exists(file_path): os.remove(file_path)
+    self.index = self.index[self.index['run_id'] != run_id].reset_index(drop=True)
+    self.index.to_csv(self.index_path, sep='\t', index=False)
+
+
+  def find(self, group=None, sample=None, date_from=None, date_to=None, data_path=None, run_id=None):
+    """
+    Find curves in the index. Only the index is read.
+
+    Key Word Arguments:
+    - group, sample, data_path, run_id
+        A value or a list of values to match. None matches everything.
+
+    - date_from, date_to
+        Earliest and latest date to match, as YYYY-MM-DD (or datetime.date), inclusive
+
+    Returns the matching rows of the index
+    """
+    keep = np.ones(len(self.index), dtype=bool)
+    for column, values in (('group', group), ('sample', sample), ('data_path', data_path), ('run_id', run_id)):
+      if values is None: continue
+      if isinstance(values, str): values = [values]
+      keep &= self.index[column].isin([str(x) for x in values]).to_numpy()
+    if date_from is not None: keep &= (self.index['date'] >= str(date_from)[:10]).to_numpy()
+    if date_to is not None: keep &= (self.index['date'] <= str(date_to)[:10]).to_numpy()
+    return self.index[keep]
+
+
+  def query(self, **kwargs):
+    """
+    Get the curves that match the key word arguments of find(), e.g.
+    archive.query(group='M9-glucose', sample='Strain3')
+
+    Only the matching columns of the matching runs are read from disk.
+
+    Returns a long-format DataFrame with columns run_id, date, group, sample, Time and OD
+    """
+    matches = self.find(**kwargs)
+    tables = []
+    for run_id, run_matches in matches.groupby('run_id', sort=False):
+      header, arrays = _open_binary_summary(self.summary_file(run_id))
+      time_values = np.asarray(arrays['time'])
+      od_values = np.asarray(arrays['od'][run_matches['column'].to_numpy()])
+      n_times = len(time_values)
+      tables.append(pd.DataFrame({'run_id': run_id,
+                                  'date': np.repeat(run_matches['date'].to_numpy(), n_times),
+                                  'group': np.repeat(run_matches['group'].to_numpy(), n_times),
+                                  'sample': np.repeat(run_matches['sample'].to_numpy(), n_times),
+                                  'Time': np.tile(time_values, len(run_matches)),
+                                  'OD': od_values.ravel()}))
+    if not tables:
+      return pd.DataFrame(columns=['run_id', 'date', 'group', 'sample', 'Time', 'OD'])
+    return pd.concat(tables, ignore_index=True)
+
+
+  def load(self, run_id):
+    """ Load a run from the archive into an Experiment, see Experiment.load_summary() """
+    if run_id not in self.run_ids(): raise RuntimeError('Run %s is not in the archive' % run_id)
+    expt = Experiment()
+    expt.load_summary(self.summary_file(run_id))
+    return expt
+
+
+  def combine(self, run_ids=None, **kwargs):
+    """
+    Merge archived runs into one set of curves on a common time grid, see
+    bioscreen.merge_experiments() for the key word arguments. Defaults to every run.
+    """
+    if run_ids is None: run_ids = self.run_ids()
+    return merge_experiments([self.load(x) for x in run_ids], **kwargs)
+
+
+  def load_raw(self, run_id):
+    """ The raw readings of an archived run, as a BioscreenExport """
+    if not os.path.exists(self.raw_file(run_id)):
+      raise RuntimeError('Raw data was not archived for run %s' % run_id)
+    header, arrays = _open_binary_summary(self.raw_file(run_id))
+    return BioscreenExport(arrays['time'].astype(str), np.asarray(arrays['od']).T, header['columns'], header['metadata'])
+
+
+  def resummarize(self, run_id, configuration=None, update=False, **kwargs):
+    """
+    Summarize an archived run again from its archived raw readings, without the original export
+
+    Positional Arguments:
+    (1) run_id
+
+    Key Word Arguments:
+    - configuration=None
+        New configuration (file, list or configured Experiment). Defaults to the
+        configuration the run was archived with.
+
+    - update=False
+        If True, the run in the archive is replaced by the new summary
+
+    Other key word arguments (e.g. timepoints) are passed to Experiment.summarize().
+    Returns the new Experiment
+    """
+    export = self.load_raw(run_id)
+    if configuration is None:
+      header, arrays = _open_binary_summary(self.summary_file(run_id))
+      configuration = header['configuration']
+    configuration = _batch_configuration(configuration)
+    data_path = self.find(run_id=run_id)['data_path'].iloc[0] or None
+    expt = Experiment()
+    expt.configuration = configuration
+    kwargs.setdefault('keep_raw', update)
+    expt.summarize(data_path, reader=lambda *args, **reader_kwargs: export, **kwargs)
+    if update:
+      date = self.find(run_id=run_id)['date'].iloc[0]
+      self.add(expt, run_id=run_id, date=date, replace=True)
+    return expt
+
+
+  def merge(self, other):
+    """
+    Copy the runs of another RunArchive (or archive directory) into this one.
+    Runs whose run_id is already in this archive get a number added to their run_id.
+
+    Returns the run_ids of the copied runs in this archive
+    """
+    if not isinstance(other, RunArchive): other = RunArchive(other)
+    new_ids = []
+    for run_id in other.run_ids():
+      new_id = run_id
+      copy_number = 1
+      while new_id in self.run_ids():
+        copy_number += 1
+        new_id = '%s_%s' % (run_id, copy_number)
+      shutil.copyfile(other.summary_file(run_id), self.summary_file(new_id))
+      if os.path.exists(other.raw_file(run_id)): shutil.copyfile(other.raw_file(run_id), self.raw_file(new_id))
+      rows = other.find(run_id=run_id).assign(run_id=new_id)
+      rows.to_csv(self.index_path, sep='\t', index=False, header=not os.path.exists(self.index_path), mode='a')
+      self.index = pd.concat([self.index, rows], ignore_index=True)
+      new_ids.append(new_id)
+    return new_ids
+
+
+class ExportCache:
+
+  def __init__(self, directory, max_bytes=1024 ** 3):
+    """
+    An ExportCache keeps parsed Bioscreen exports on disk so that summarizing the same data
+    file again skips decoding and parsing. Use it with Experiment.summarize(cache=...).
+
+    Entries are keyed by a hash of the file contents plus the reader arguments, so an
+    edited file is never matched to an old entry. Each entry holds the readings, the
+    time stamps, and the time points converted to minutes, hours and days. When the cache
+    grows past max_bytes, the least recently used entries are removed.
+
+    Positional Arguments:
+    (1) cache directory. It is created if it does not exist.
+
+    Key Word Arguments:
+    - max_bytes=1024 ** 3
+        Largest total size of the cache files (1 GB)
+    """
+    self.directory = directory
+    self.max_bytes = max_bytes
+    os.makedirs(self.directory, exist_ok=True)
+
+
+  def __repr__(self):
+    return 'An ExportCache in the bioscreen module\n\tDirectory: {}\n\tEntries: {}\n\tSize: {} of {} bytes'.format(
+      self.directory, len(self._entries()), self.size(), self.max_bytes)
+
+
+  def key(self, data_path, input_encoding='utf_16_le', rows_to_skip=2, sep=',', reader='pandas'):
+    """
+    The cache key for a data file: a hash of its contents, followed by a hash of the
+    arguments used to read it
+    """
+    content_hash = hashlib.blake2b(digest_size=16)
+    with open(data_path, 'rb') as data_file:
+      for block in iter(lambda: data_file.read(1024 ** 2), b''):
+        content_hash.update(block)
+    if not isinstance(reader, str):
+      # readers by their name in READERS, so that the key is the same whichever module
+      # bioscreen was loaded as (e.g. __main__ for the command line)
+      names = [name for name, function in READERS.items() if function is reader]
+      reader = names[0] if names else '%s.%s' % (getattr(reader, '__module__', ''),
+        getattr(reader, '__qualname__', repr(reader)))
+    arguments = repr((input_encoding, rows_to_skip, sep, reader)).encode('utf-8')
+    return '%s-%s' % (content_hash.hexdigest(), hashlib.blake2b(arguments, digest_size=4).hexdigest())
+
+
+  def _path(self, key):
+    return os.path.join(self.directory, key + SUMMARY_EXTENSION)
+
+
+  def _entries(self):
+    """
+    The path and size of each cache file, least recently used first. Files removed by
+    another process (e.g. a process_runs() worker) while listing are left out.
+    """
+    entries = []
+    for name in os.listdir(self.directory):
+      if not name.endswith(SUMMARY_EXTENSION): continue
+      path = os.path.join(self.directory, name)
+      try:
+        stat = os.stat(path)
+      except FileNotFoundError:
+        continue
+      entries.append((stat.st_mtime, path, stat.st_size))
+    return [(path, size) for mtime, path, size in sorted(entries)]
+
+
+  def _remove(self, path):
+    """ Remove a cache file, unless another process already has """
+    try:
+      os.remove(path)
+    except FileNotFoundError:
+      pass
+
+
+  def size(self):
+    """ Total size of the cache files in bytes """
+    return sum([size for path, size in self._entries()])
+
+
+  def get(self, key):
+    """ The cached BioscreenExport for a key, or None if it is not in the cache """
+    path = self._path(key)
+    try:
+      header, arrays = _open_binary_summary(path)
+    except (OSError, ValueError, RuntimeError):
+      return None
+    try:
+      os.utime(path)    # mark as recently used
+    except FileNotFoundError:
+      pass
+    export = BioscreenExport(arrays['time'].astype(str), arrays['od'], header['columns'], header['metadata'])
+    for unit in ('minutes', 'hours', 'days'): export._times[unit] = arrays[unit]
+    return export
+
+
+  def put(self, key, export, data_path=None):
+    """
+    Add a BioscreenExport to the cache, then remove the least recently used entries if the
+    cache is larger than max_bytes
+    """
+    header = {'columns': export.columns, 'metadata': export.metadata,
+              'data_path': None if data_path is None else os.path.abspath(str(data_path))}
+    arrays = {'time': export.time.astype('S'), 'od': np.asarray(export.od)}
+    try:
+      for unit in ('minutes', 'hours', 'days'): arrays[unit] = export.times(unit)
+    except RuntimeError:
+      # time stamps that are not HH:MM:SS. Only a list of timepoints can be used with these
+      return
+    temporary_path = self._path(key) + '.%s.tmp' % os.getpid()
+    _write_binary_file(temporary_path, header, arrays)
+    os.replace(temporary_path, self._path(key))
+
+    entries = self._entries()
+    total = sum([size for path, size in entries])
+    for path, size in entries:
+      if total <= self.max_bytes: break
+      total -= size
+      self._remove(path)
+
+
+  def invalidate(self, data_path):
+    """
+    Remove the cached entries of a data file: entries for its current contents and entries
+    that were made from the same path. Returns the number of entries removed.
+    """
+    content_key = self.key(data_path).split('-')[0] if os.path.exists(data_path) else None
+    data_path = os.path.abspath(str(data_path))
+    removed = 0
+    for path, size in self._entries():
+      if (content_key is not None) and os.path.basename(path).startswith(content_key + '-'):
+        matches = True
+      else:
+        try:
+          matches = _open_binary_summary(path)[0].get('data_path') == data_path
+        except (OSError, ValueError, RuntimeError):
+          matches = True
+      if matches:
+        self._remove(path)
+        removed += 1
+    return removed
+
+
+  def clear(self):
+    """ Remove every entry in the cache """
+    for path, size in self._entries(): self._remove(path)
+
+
+def _summary_frame(timepoints, values, labels):
+  """ A summary DataFrame: the Time column followed by a column of values for each label """
+  frame = pd.DataFrame(values, columns=labels)
+  frame.insert(0, 'Time', timepoints)
+  return frame
+
+
+def _matplotlib():
+  """
+  Import matplotlib the first time something is graphed, rather than with the module, so
+  that summarizing and configuring never pay for its startup.
+
+  Without a display (e.g. on a headless worker) the Agg backend is selected, unless a
+  backend was chosen with MPLBACKEND or before bioscreen imported matplotlib.
+  """
+  if 'matplotlib.figure' not in sys.modules:
+    backend_chosen = ('MPLBACKEND' in os.environ) or ('matplotlib' in sys.modules)
+    import matplotlib
+    if (not backend_chosen) and _headless(): matplotlib.use('Agg')
+  # always imported, as the caller may have imported matplotlib (e.g. pyplot) without them
+  import matplotlib.backends.backend_agg
+  import matplotlib.figure
+  return sys.modules['matplotlib']
+
+
+def _headless():
+  """ Whether there is no display to draw on """
+  if sys.platform.startswith('linux') or sys.platform.startswith('freebsd'):
+    return not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+  return False
+
+
+def _new_figure(size_inches=(8, 8)):
+  """
+  A matplotlib Figure drawn with the Agg canvas, without pyplot and its global state
+  """
+  matplotlib = _matplotlib()
+  figure = matplotlib.figure.Figure(figsize=size_inches)
+  matplotlib.backends.backend_agg.FigureCanvasAgg(figure)
+  return figure
+
+
+def _base64_array(values):
+  """ An array as base64 text, for embedding in a report """
+  return base64.b64encode(np.ascontiguousarray(values).tobytes()).decode('ascii')
+
+
+def _html_escape(text):
+  return str(text).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+
+def _html_table(table):
+  """
+  A growth parameter table (see Experiment.growth_parameters) as an HTML table. Each row
+  is tagged with its group__sample, so the report can hide it along with the curve.
+  """
+  rows = ['<tr>' + ''.join(['<th>%s</th>' % _html_escape(x) for x in table.columns]) + '</tr>']
+  for record in table.itertuples(index=False):
+    cells = []
+    for value in record:
+      if isinstance(value, (float, np.floating)): value = '' if np.isnan(value) else '%.4g' % value
+      cells.append('<td>%s</td>' % _html_escape(value))
+    label = '%s__%s' % (record[0], record[1])
+    rows.append('<tr data-label="%s">%s</tr>' % (_html_escape(label), ''.join(cells)))
+  return '<h2>Growth parameters</h2>\n<table class="parameters">\n%s\n</table>' % '\n'.join(rows)
+
+
+# page written by Experiment.write_report(). {{title}}, {{parameters}} and {{data}} are filled in
+REPORT_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{{title}}</title>
+<style>
+body { font-family: sans-serif; margin: 20px; color: #222; }
+#main { display: flex; align-items: flex-start; gap: 20px; }
+#controls { min-width: 220px; max-height: 560px; overflow-y: auto; font-size: 13px; }
+#controls .group { margin-bottom: 6px; }
+#controls .samples { margin-left: 18px; }
+#controls .swatch { display: inline-block; width: 10px; height: 10px; margin-right: 4px; }
+svg text { font-size: 12px; }
+table.parameters { border-collapse: collapse; font-size: 13px; margin-top: 10px; }
+table.parameters th, table.parameters td { border: 1px solid #ccc; padding: 3px 8px; text-align: right; }
+table.parameters tr.hidden { display: none; }
+</style>
+</head>
+<body>
+<h1>{{title}}</h1>
+<div id="main">
+<svg id="graph" width="820" height="560"></svg>
+<div id="controls">
+<button id="show-all">Show all</button> <button id="hide-all">Hide all</button>
+<div id="groups"></div>
+</div>
+</div>
+{{parameters}}
+<script id="report-data" type="application/json">{{data}}</script>
+<script>
+(function () {
+  var data = JSON.parse(document.getElementById('report-data').textContent);
+  function decode(text, Type) {
+    var bytes = atob(text), buffer = new Uint8Array(bytes.length);
+    for (var i = 0; i < bytes.length; i++) buffer[i] = bytes.charCodeAt(i);
+    return new Type(buffer.buffer);
+  }
+  var time = decode(data.time, Float64Array), n = time.length, labels = data.labels;
+  var values = decode(data.values, Float32Array);
+  var spread = data.spread ? decode(data.spread, Float32Array) : null;
+  var shown = labels.map(function () { return true; });
+  var colors = labels.map(function (label, i) {
+    return 'hsl(' + Math.round(270 * (1 - i / Math.max(labels.length - 1, 1))) + ', 85%, 45%)';
+  });
+
+  // axis ranges over all of the curves, so the axes do not jump when curves are hidden
+  var low = Infinity, high = -Infinity;
+  for (var i = 0; i < values.length; i++) {
+    var extra = spread ? spread[i] || 0 : 0;
+    if (!isNaN(values[i])) { low = Math.min(low, values[i] - extra); high = Math.max(high, values[i] + extra); }
+  }
+  if (!isFinite(low)) { low = 0; high = 1; }
+  if (high === low) high = low + 1;
+  var x0 = n ? time[0] : 0, x1 = n ? time[n - 1] : 1;
+  if (x1 === x0) x1 = x0 + 1;
+  var svg = document.getElementById('graph'), namespace = 'http://www.w3.org/2000/svg';
+  var left = 60, right = 800, top = 20, bottom = 510;
+  function sx(x) { return left + (x - x0) / (x1 - x0) * (right - left); }
+  function sy(y) { return bottom - (y - low) / (high - low) * (bottom - top); }
+  function element(name, attributes, parent) {
+    var node = document.createElementNS(namespace, name);
+    for (var key in attributes) node.setAttribute(key, attributes[key]);
+    (parent || svg).appendChild(node);
+    return node;
+  }
+  function ticks(a, b) {
+    var step = Math.pow(10, Math.floor(Math.log10((b - a) / 5))), found = [];
+    if ((b - a) / step > 10) step *= 2;
+    if ((b - a) / step > 10) step *= 2.5;
+    for (var t = Math.ceil(a / step) * step; t <= b + step * 1e-9; t += step) found.push(+t.toPrecision(10));
+    return found;
+  }
+  ticks(x0, x1).forEach(function (t) {
+    element('line', {x1: sx(t), x2: sx(t), y1: top, y2: bottom, stroke: '#eee'});
+    element('text', {x: sx(t), y: bottom + 18, 'text-anchor': 'middle'}).textContent = t;
+  });
+  ticks(low, high).forEach(function (t) {
+    element('line', {x1: left, x2: right, y1: sy(t), y2: sy(t), stroke: '#eee'});
+    element('text', {x: left - 6, y: sy(t) + 4, 'text-anchor': 'end'}).textContent = t;
+  });
+  element('rect', {x: left, y: top, width: right - left, height: bottom - top, fill: 'none', stroke: '#444'});
+  element('text', {x: (left + right) / 2, y: bottom + 40, 'text-anchor': 'middle'}).textContent = data.xlabel;
+  element('text', {x: 16, y: (top + bottom) / 2, 'text-anchor': 'middle',
+                   transform: 'rotate(-90 16 ' + (top + bottom) / 2 + ')'}).textContent = data.ylabel;
+
+  // one path for each curve (and its band), broken where readings are missing
+  var curves = labels.map(function (label, c) {
+    var node = element('g', {});
+    var line = '', band = [], upper = '', lower = '';
+    for (var i = 0; i < n; i++) {
+      var y = values[c * n + i];
+      if (isNaN(y)) { line += ' '; continue; }
+      line += (line === '' || line.slice(-1) === ' ' ? 'M' : 'L') + sx(time[i]).toFixed(1) + ',' + sy(y).toFixed(2);
+      if (spread && !isNaN(spread[c * n + i])) band.push([time[i], y, spread[c * n + i]]);
+    }
+    if (band.length) {
+      var points = band.map(function (p) { return sx(p[0]).toFixed(1) + ',' + sy(p[1] + p[2]).toFixed(2); });
+      band.reverse().forEach(function (p) { points.push(sx(p[0]).toFixed(1) + ',' + sy(p[1] - p[2]).toFixed(2)); });
+      element('polygon', {points: points.join(' '), fill: colors[c], opacity: 0.2}, node);
+    }
+    var path = element('path', {d: line, fill: 'none', stroke: colors[c], 'stroke-width': 1.5}, node);
+    element('title', {}, path).textContent = label;
+    return node;
+  });
+
+  var rows = document.querySelectorAll('table.parameters tr[data-label]');
+  function update() {
+    curves.forEach(function (node, c) { node.style.display = shown[c] ? '' : 'none'; });
+    rows.forEach(function (row) {
+      var c = labels.indexOf(row.getAttribute('data-label'));
+      row.classList.toggle('hidden', c >= 0 && !shown[c]);
+    });
+    boxes.forEach(function (box) {
+      var members = box.members.map(function (c) { return shown[c]; });
+      box.checked = members.every(Boolean);
+      box.indeterminate = !box.checked && members.some(Boolean);
+    });
+  }
+
+  // a check box for each group, and one for each sample in it
+  var boxes = [], groups = [], container = document.getElementById('groups');
+  labels.forEach(function (label, c) {
+    var group = label.split('__')[0];
+    if (groups.indexOf(group) < 0) groups.push(group);
+  });
+  groups.forEach(function (group) {
+    var members = [];
+    labels.forEach(function (label, c) { if (label.split('__')[0] === group) members.push(c); });
+    var div = document.createElement('div'), samples = document.createElement('div');
+    div.className = 'group';
+    samples.className = 'samples';
+    var heading = document.createElement('label'), box = document.createElement('input');
+    box.type = 'checkbox';
+    box.members = members;
+    box.onchange = function () { members.forEach(function (c) { shown[c] = box.checked; }); update(); };
+    boxes.push(box);
+    heading.appendChild(box);
+    heading.appendChild(document.createTextNode(' ' + group));
+    div.appendChild(heading);
+    members.forEach(function (c) {
+      var item = document.createElement('label'), sample_box = document.createElement('input');
+      var swatch = document.createElement('span');
+      sample_box.type = 'checkbox';
+      sample_box.members = [c];
+      sample_box.onchange = function () { shown[c] = sample_box.checked; update(); };
+      boxes.push(sample_box);
+      swatch.className = 'swatch';
+      swatch.style.background = colors[c];
+      item.appendChild(sample_box);
+      item.appendChild(swatch);
+      item.appendChild(document.createTextNode(labels[c].split('__').slice(1).join('__')));
+      samples.appendChild(item);
+      samples.appendChild(document.createElement('br'));
+    });
+    div.appendChild(samples);
+    container.appendChild(div);
+  });
+  document.getElementById('show-all').onclick = function () { shown = shown.map(function () { return true; }); update(); };
+  document.getElementById('hide-all').onclick = function () { shown = shown.map(function () { return false; }); update(); };
+  update();
+})();
+</script>
+</body>
+</html>
+"""
+
+
+class BioscreenExport:
+
+  def __init__(self, time, od, columns, metadata=None):
+    """
+    The readings from a Bioscreen C export file, as returned by read_export()
+
+    Attributes:
+    - time
+        array of the time stamps (HH:MM:SS), one for each reading. See convert_time()
+    - od
+        2D float array of OD readings, time points x columns
+    - columns
+        list of the column names (the well numbers as strings, and 'Blank')
+    - metadata
+        dictionary of the information found above the column headers. 'instrument',
+        'wavelength' and 'wells' (the number of well columns) are always included and
+        are None if the file does not say.
+    """
+    self.time = np.asarray(time, dtype=str)
+    self.od = od
+    self.columns = list(columns)
+    self.metadata = {'instrument': None, 'wavelength': None}
+    if metadata is not None: self.metadata.update(metadata)
+    self.metadata['wells'] = len(self.wells)
+    self._times = {}
+
+
+  def times(self, timepoints='hours'):
+    """
+    The time stamps converted to minutes, hours or days (see convert_time).
+    Each conversion is only done once.
+    """
+    unit = TIME_UNITS.get(str(timepoints).lower())
+    if unit is None:
+      raise RuntimeError('Timepoints argument not a valid value: days, hours, or minutes')
+    if unit not in self._times: self._times[unit] = convert_time(self.time, unit)
+    return self._times[unit]
+
+
+  @property
+  def wells(self):
+    """ The well numbers in the file """
+    return [int(x) for x in self.columns if x.isdigit()]
+
+
+  def to_frame(self):
+    """
+    The readings as a pandas DataFrame, laid out as pandas.read_csv() would read the file
+    """
+    frame = pd.DataFrame(self.od, columns=self.columns, copy=False)
+    frame.insert(0, 'Time', self.time)
+    return frame
+
+
+  @classmethod
+  def from_frame(cls, frame, metadata=None):
+    """
+    Create a BioscreenExport from a DataFrame with a Time column and a column per well
+    """
+    well_data = frame.select_dtypes(include='number')
+    return cls(frame.Time, well_data.to_numpy(dtype=float), [str(x) for x in well_data.columns], metadata)
+
+
+def read_export(data_path, input_encoding='utf_16_le', sep=None, dtype=np.float64, **kwargs):
+  """
+  read_export() reads a .csv or .txt export from the Bioscreen C into a BioscreenExport.
+  It is used by Experiment.summarize(reader='native'), and by the chunked and incremental
+  summaries and ingest(), which parse the readings the same way.
+
+  The row with the column headers (starting with "Time") is found, so there is no need to
+  say how many rows to skip. Rows above the headers are kept in the metadata. The rest of
+  the file is streamed into the C parser of pandas (.csv files), or parsed as one block with
+  numpy.loadtxt() (.txt files, which it reads quicker than pandas), so reading takes about as
+  long as pandas.read_csv().
+
+  Positional Arguments:
+  (1) path to data file
+
+  Key Word Arguments:
+  - input_encoding='utf_16_le'
+
+  - sep=None
+      The separator/delimiter used in the file. If None (or ','), it is ',' if the header
+      row has commas (.csv files), otherwise white space (.txt files). '\\s+' also means
+      white space.
+
+  - dtype=np.float64
+      Type of the OD array, e.g. np.float32 to halve the memory used
+
+  Other key word arguments (such as rows_to_skip) are accepted and ignored, so that
+  read_export can be passed as the reader to Experiment.summarize()
+  """
+  with open(data_path, 'r', encoding=input_encoding) as data_file:
+    lines, sep = _read_preamble(data_file, sep)
+    columns = [x.strip('"') for x in lines[-1].split(sep)][1:]
+    if sep is None: time, od = _parse_rows(data_file.read(), sep, len(columns), dtype)
+    else: time, od = _parse_delimited_rows(data_file, sep, len(columns), dtype)
+  return BioscreenExport(time, od, columns, _parse_metadata(lines[:-1], sep))
+
+
+def parse_export(data, input_encoding='utf_16_le', sep=None, dtype=np.float64):
+  """
+  Parse the contents of a Bioscreen C export (bytes, or an already decoded string).
+  See read_export() for the key word arguments.
+  """
+  if isinstance(data, bytes):
+    # the byte order mark is left out, so that the text of most exports is ASCII, which is
+    # quicker to copy and encode for the C parser of pandas
+    bom = '\ufeff'.encode(input_encoding)
+    data = codecs.decode(memoryview(data)[len(bom):] if data.startswith(bom) else data, input_encoding)
+
+  # only the lines down to the header row are split up, the readings are parsed as one block
+  lines = []
+  position = 1 if data.startswith('\ufeff') else 0
+  while True:
+    end = data.find('\n', position)
+    lines.append(data[position:(len(data) if end < 0 else end)].rstrip('\r'))
+    try:
+      header_row, sep = _find_header(lines[-1:], sep)
+      break
+    except RuntimeError:
+      if end < 0: raise
+      position = end + 1
+  metadata = _parse_metadata(lines[:-1], sep)
+
+  columns = [x.strip('"') for x in lines[-1].split(sep)][1:]
+  if end < 0: time, od = _parse_rows('', sep, len(columns), dtype)
+  else: time, od = _parse_rows(data[end + 1:], sep, len(columns), dtype)
+
+  return BioscreenExport(time, od, columns, metadata)
+
+
+def _parse_metadata(lines, sep):
+  """ The information in the rows of a data file above the column headers, as a dictionary """
+  metadata = {}
+  for line in lines:
+    fields = [x.strip().strip('"').strip() for x in line.split(sep)]
+    if len(fields) == 1 and ':' in fields[0]: fields = [x.strip() for x in fields[0].split(':', 1)]
+    if not fields[0]: continue
+    key = fields[0].rstrip(':')
+    metadata[key] = ' '.join([x for x in fields[1:] if x])
+    if 'wavelength' in key.lower() or 'filter' in key.lower():
+      wavelength = re.search('[0-9]+', metadata[key])
+      if wavelength: metadata['wavelength'] = int(wavelength.group())
+    if 'instrument' in key.lower(): metadata['instrument'] = metadata[key]
+    elif (metadata.get('instrument') is None) and ('bioscreen' in line.lower()):
+      metadata['instrument'] = ' '.join([x for x in fields if x])
+  return metadata
+
+
+def _read_preamble(data_file, sep):
+  """
+  Read the lines of an open data file down to the header row, see _find_header().
+  Returns the lines (the header row last) and the separator. The file is left at the first
+  row of readings.
+  """
+  lines = []
+  while True:
+    line = data_file.readline()
+    if not line: raise RuntimeError('Unable to find the header row (starting with Time) in the data file')
+    lines.append(line.lstrip('\ufeff').rstrip('\r\n'))
+    try:
+      header_row, sep = _find_header(lines[-1:], sep)
+      return lines, sep
+    except RuntimeError:
+      continue
+
+
+def _find_header(lines, sep):
+  """
+  Find the row of column headers (starting with Time) in the lines of a data file.
+  Returns the row number and the separator, which is worked out from the header row if
+  sep is None or '\\s+' (None is returned for white space). A header row without commas
+  is taken to be separated by white space when sep is ',', the default of summarize(), so
+  that .txt exports are read without setting sep.
+  """
+  if sep == r'\s+': sep = None
+  for i, line in enumerate(lines):
+    first_field = line.split(',', 1)[0].split(None, 1)
+    if first_field and first_field[0].strip('"') == 'Time':
+      if sep in (None, ','): sep = ',' if ',' in line else None
+      return i, sep
+  raise RuntimeError('Unable to find the header row (starting with Time) in the data file')
+
+
+def _parse_rows(text, sep, n_columns, dtype=np.float64):
+  """
+  Parse rows of readings from a data file (the text below the header row).
+  Returns an array of the time stamps and a 2D array of the readings, rows x n_columns.
+  """
+  if sep is not None: return _parse_delimited_rows(text, sep, n_columns, dtype)
+  first = re.match(r'\s*"?([^\s,"]+)', text)
+  time = ([first.group(1)] if first else []) + re.findall(r'\n[ \t]*"?([^\s,"]+)', text)
+  if not time: return np.zeros(0, dtype=str), np.empty((0, n_columns), dtype=dtype)
+
+  # the colons of the HH:MM:SS time stamps are made into separators, so that the whole
+  # block parses in one pass with numpy.loadtxt(), hours, minutes and seconds as 3 extra columns.
+  # For white space, this is quicker than the C parser of pandas (see _parse_delimited_rows)
+  try:
+    with warnings.catch_warnings():
+      warnings.simplefilter('error', UserWarning)
+      od = np.loadtxt(text.replace(':', ' ').splitlines(), dtype=dtype, quotechar='"', ndmin=2)
+    if od.shape != (len(time), n_columns + 3): raise ValueError
+    od = od[:, 3:]
+  except (ValueError, UserWarning):
+    # blank or quoted readings, rows of different lengths, or other time stamps
+    time, od = _parse_rows_slowly(text.strip().splitlines(), sep, n_columns, dtype)
+
+  return np.asarray(time, dtype=str), od
+
+
+def _parse_delimited_rows(rows, sep, n_columns, dtype=np.float64):
+  """
+  _parse_rows() for rows with a separator (e.g. .csv files), given as text or as an open
+  file at the first row. They are parsed by the C parser of pandas, text as UTF-8.
+  """
+  position = None if isinstance(rows, str) else rows.tell()
+  try:
+    source = io.BytesIO(rows.encode('utf-8')) if position is None else rows
+    frame = pd.read_csv(source, sep=sep, header=None, engine='c')
+    if frame.shape[1] != n_columns + 1: raise ValueError
+    time = frame[0].to_numpy(dtype=str)
+    od = frame.iloc[:, 1:].to_numpy(dtype=dtype)
+  except ValueError:
+    # no rows, rows longer than the header, or readings that are not numbers
+    if position is not None:
+      rows.seek(position)
+      rows = rows.read()
+    time, od = _parse_rows_slowly(rows.strip().splitlines(), sep, n_columns, dtype)
+    time = np.asarray(time, dtype=str)
+  return time, od
+
+
+def _parse_rows_slowly(lines, sep, n_columns, dtype=np.float64):
+  """ _parse_rows() one reading at a time, for rows that do not parse as one block """
+  body = [x for x in lines if x.strip()]
+  time = []
+  od = np.full((len(body), n_columns), np.nan, dtype=dtype)
+  for i, line in enumerate(body):
+    fields = line.strip().split(sep, 1)
+    time.append(fields[0].strip('"'))
+    if len(fields) < 2: continue
+    for j, value in enumerate(fields[1].split(sep)[:n_columns]):
+      value = value.strip().strip('"')
+      if value:
+        try: od[i, j] = float(value)
+        except ValueError: pass
+  return time, od
+
+
+def _read_csv(data_path, input_encoding='utf_16_le', rows_to_skip=2, sep=','):
+  """ Read a data file with pandas.read_csv() """
+  return pd.read_csv(data_path, encoding=input_encoding, skiprows=rows_to_skip, sep=sep)
+
+
+# readers that can be given by name to Experiment.summarize()
+READERS = {'pandas': _read_csv, 'native': read_export}
+
+
+class WellIndex:
+
+  def __init__(self, configuration, columns):
+    """
+    A WellIndex is an experiment configuration compiled against the columns of a data file.
+
+    Each blank and sample in the configuration becomes a row of self.index, an integer
+    matrix holding the positions of its wells in the data columns. Rows are padded out to
+    the largest number of replicates and self.mask marks which entries are real wells.
+    self.sample_rows and self.blank_rows map each summary column (self.labels, named
+    group__sample) onto its own row and onto the row of its group's blank (-1 if the group
+    has no blank).
+
+    As with DataFrame.filter(), wells that are not found in the columns are ignored.
+    RawData lays the readings out in the order of these rows, and the statistics of
+    summarize() are made from it.
+
+    Positional Arguments:
+    (1) configuration, as set by Experiment.set_config() or set_config_from_file()
+    (2) column names of the loaded data
+    """
+    column_positions = {}
+    for i, column in enumerate(columns):
+      column_positions.setdefault(str(column), i)
+
+    well_sets = []
+    sample_rows = []
+    blank_rows = []
+    self.labels = []
+    self.row_labels = []
+    self.columns = [str(x) for x in columns]
+    for group in configuration:
+      blank_row = -1
+      if 'blank' in group:
+        blank_row = len(well_sets)
+        well_sets.append(_well_positions(group['blank'], column_positions))
+        self.row_labels.append((group['group'], 'blank'))
+      for sample, wells in list(group.items()):
+        if (sample == 'group') or (sample == 'blank'): continue
+        sample_rows.append(len(well_sets))
+        blank_rows.append(blank_row)
+        well_sets.append(_well_positions(wells, column_positions))
+        self.labels.append('%s__%s' % (group['group'], sample))
+        self.row_labels.append((group['group'], sample))
+
+    max_replicates = max([len(x) for x in well_sets] + [1])
+    self.index = np.zeros((len(well_sets), max_replicates), dtype=np.intp)
+    self.mask = np.zeros((len(well_sets), max_replicates), dtype=bool)
+    for i, positions in enumerate(well_sets):
+      self.index[i, :len(positions)] = positions
+      self.mask[i, :len(positions)] = True
+    self.sample_rows = np.array(sample_rows, dtype=np.intp)
+    self.blank_rows = np.array(blank_rows, dtype=np.intp)
+
+
+class RawData:
+
+  def __init__(self, od, columns, well_index=None, stamps=None, time=None, metadata=None):
+    """
+    The raw readings of a run as a wells x time points array, laid out in the order of the
+    experiment configuration
+
+    The wells of each group are stored next to each other (its blank, then each of its
+    samples, as configured), followed by the columns that are not configured. Because of
+    this, the readings of any well, sample or group are a NumPy view of a block of rows of
+    self.od, without copying. The statistics of summarize() are made from these blocks.
+
+    Positional Arguments:
+    (1) 2D array of OD readings, time points x columns, as read from the data file
+    (2) column names (the well numbers as strings, and 'Blank')
+
+    Key Word Arguments:
+    - well_index=None
+        WellIndex of the configuration for these columns. Without one, the rows are in the
+        order of the columns and only wells can be looked up.
+    - stamps=None
+        time stamps (HH:MM:SS) of the readings
+    - time=None
+        time points of the readings, in the units of the summary
+    - metadata=None
+        information from the top of the data file
+
+    Attributes:
+    - od
+        2D array of OD readings, wells x time points (the type of the readings is kept)
+    - columns
+        data column of each row of od
+    - file_columns
+        the columns in the order of the data file
+    - wells
+        integer array of the well number of each row of od (0 for the Blank column)
+    - time, stamps, metadata
+    - labels
+        group__sample of each summary curve, as in the summary
+    """
+    columns = [str(x) for x in columns]
+    od = np.asarray(od)
+    if well_index is None:
+      order = np.arange(len(columns))
+      lengths = np.zeros(0, dtype=np.intp)
+      self.labels = []
+      self.row_labels = []
+      self.sample_rows = self.blank_rows = np.zeros(0, dtype=np.intp)
+    else:
+      configured = well_index.index[well_index.mask]
+      unused = np.setdiff1d(np.arange(len(columns)), configured)
+      order = np.concatenate([configured, unused]).astype(np.intp)
+      lengths = well_index.mask.sum(axis=1)
+      self.labels = well_index.labels
+      self.row_labels = well_index.row_labels
+      self.sample_rows = well_index.sample_rows
+      self.blank_rows = well_index.blank_rows
+    self.well_index = well_index
+
+    # the one copy: the readings are gathered into configuration order, a row for each well
+    self.od = od.T[order]
+    self.columns = [columns[x] for x in order]
+    self.file_columns = columns
+    self.wells = np.array([int(x) if x.isdigit() else 0 for x in self.columns], dtype=np.intp)
+    self.stamps = None if stamps is None else np.asarray(stamps, dtype=str)
+    self.time = None if time is None else np.asarray(time, dtype=float)
+    self.metadata = {} if metadata is None else metadata
+
+    # rows of od of each blank and sample (the rows of the WellIndex), and of each group
+    self.bounds = np.zeros((len(lengths), 2), dtype=np.intp)
+    self.bounds[:, 1] = np.cumsum(lengths)
+    self.bounds[:, 0] = self.bounds[:, 1] - lengths
+    self.n_configured = int(lengths.sum())
+    self.owners = np.repeat(np.arange(len(lengths)), lengths)
+
+    # the same rows padded out to the most replicates, for the statistics: these add up the
+    # replicates of each blank and sample in the order that the summaries have always used
+    replicates = np.arange(max(list(lengths) + [1]))
+    self._replicates = replicates < lengths[:, np.newaxis]
+    self._replicate_rows = np.where(self._replicates, self.bounds[:, :1] + replicates, 0)
+    self._segments = {}
+    for i, (group, sample) in enumerate(self.row_labels):
+      self._segments[(group, sample)] = slice(*self.bounds[i])
+      first = self._segments.get((group, None), slice(self.bounds[i, 0], self.bounds[i, 0])).start
+      self._segments[(group, None)] = slice(first, self.bounds[i, 1])
+    self._well_rows = {}
+    for i, column in enumerate(self.columns):
+      self._well_rows.setdefault(column, i)
+    self._file_order = np.unique(order, return_index=True)[1]
+
+
+  @classmethod
+  def from_export(cls, export, well_index=None, time=None):
+    """ RawData of the readings of a BioscreenExport """
+    return cls(export.od, export.columns, well_index, export.time, time, export.metadata)
+
+
+  def __len__(self):
+    return len(self.od)
+
+
+  def __repr__(self):
+    return 'RawData(%s wells x %s time points, %s curves)' % (self.od.shape + (len(self.labels),))
+
+
+  @property
+  def groups(self):
+    """ The configured groups, in order """
+    return list(dict.fromkeys([x[0] for x in self.row_labels]))
+
+
+  def well(self, well):
+    """ The readings of a well (its number, or 'Blank'), a view of its row of self.od """
+    row = self._well_rows.get(str(well))
+    if row is None: raise RuntimeError('Well %s is not in the data' % well)
+    return self.od[row]
+
+
+  def sample(self, group, sample=None):
+    """
+    The readings of the wells of a sample (wells x time points), a view of self.od in the
+    order the wells are configured. The sample can also be given as 'group__sample'.
+    """
+    return self.od[self._segment(group, sample)]
+
+
+  def blank(self, group):
+    """ The readings of the blank wells of a group (wells x time points), a view of self.od """
+    return self.od[self._segment(group, 'blank')]
+
+
+  def group(self, group):
+    """ The readings of all of the wells of a group, its blank first (wells x time points), a view of self.od """
+    return self.od[self._segment(group, None)]
+
+
+  def sample_wells(self, group, sample=None):
+    """ The well numbers of a sample, or of a whole group if sample is None, in the order of the rows """
+    if (sample is None) and ('__' in group): group, sample = group.split('__', 1)
+    return self.wells[self._segment(group, sample)]
+
+
+  def _segment(self, group, sample):
+    """ The slice of the rows of self.od of a sample, a blank or a whole group (sample None) """
+    if (sample is None) and ('__' in group): group, sample = group.split('__', 1)
+    segment = self._segments.get((group, sample))
+    if segment is None:
+      raise RuntimeError('%s is not in the configuration of the data' % (group if sample is None else group + '__' + sample))
+    return segment
+
+
+  def to_export(self):
+    """ The readings as a BioscreenExport, with the columns in the order of the data file """
+    return BioscreenExport(self.stamps, self.od[self._file_order].T, self.file_columns, self.metadata)
+
+
+  def to_frame(self):
+    """ The readings as a pandas DataFrame, laid out as pandas.read_csv() would read the file """
+    return self.to_export().to_frame()
+
+
+  def _values(self, mask=None, dtype=None):
+    """
+    The readings of every blank and sample at each time point (time points x rows of the
+    WellIndex x replicates), and which are valid, with mask (one for each configured well)
+    """
+    values = self.od.T[:, self._replicate_rows]
+    if dtype is not None: values = values.astype(dtype, copy=False)
+    valid = self._replicates & ~np.isnan(values)
+    if mask is not None: valid &= np.asarray(mask, dtype=bool)[self._replicate_rows]
+    return values, valid
+
+
+  def means(self, mask=None, dtype=None):
+    """
+    Mean of every blank and sample (the rows of the WellIndex) at each time point.
+    Missing readings (NaN) are skipped, the same as DataFrame.mean().
+
+    Key Word Arguments:
+    - mask=None
+        Boolean array of which of the configured wells (the first rows of self.od) to use.
+        Defaults to all of them
+    - dtype=None
+        Type to convert the readings to first, e.g. np.float64 for float32 readings
+
+    Returns a 2D array, time points x rows of the WellIndex
+    """
+    values, valid = self._values(mask, dtype)
+    totals = np.where(valid, values, 0).sum(axis=2)
+    counts = valid.sum(axis=2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+      return totals / counts
+
+
+  def statistics(self, mask=None):
+    """
+    Blanked sample means, along with the spread of the sample wells, in one pass
+
+    Key Word Arguments:
+    - mask=None
+        Boolean array of which of the configured wells (the first rows of self.od) to use.
+        Defaults to all of them
+
+    Returns a dictionary of 2D arrays (time points x self.labels): 'mean' (the sample mean
+    minus the mean of its group's blank), 'sd' (standard deviation of the sample wells),
+    'sem' (standard error of the mean) and 'n' (number of wells with a reading)
+    """
+    values, valid = self._values(mask)
+    totals = np.where(valid, values, 0).sum(axis=2)
+    counts = valid.sum(axis=2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+      means = totals / counts
+      squares = np.where(valid, values - means[:, :, np.newaxis], 0) ** 2
+      sd = np.sqrt(squares.sum(axis=2) / (counts - 1))
+      blank_means = np.where(self.blank_rows >= 0, means[:, self.blank_rows], 0)
+      sample_counts = counts[:, self.sample_rows]
+      sample_sd = sd[:, self.sample_rows]
+      return {'mean': means[:, self.sample_rows] - blank_means, 'sd': sample_sd,
+              'sem': sample_sd / np.sqrt(sample_counts), 'n': sample_counts}
+
+
+  def well_scores(self, min_scale=0.005):
+    """
+    Robust deviation score of every configured well from the other replicates of its sample
+    (or blank)
+
+    At each time point, a well's distance from the median of its replicates is divided by
+    1.4826 x the median absolute deviation (MAD) of the replicates, or by min_scale if that
+    is smaller, so that nearly identical replicates do not give huge scores. The well's
+    score is the median of this robust z-score over all time points, so a well that is off
+    for the whole run scores high while a single noisy reading does not.
+
+    Key Word Arguments:
+    - min_scale=0.005
+        Smallest OD spread used for the z-scores
+
+    Returns an array with the score of each configured well (the first rows of self.od)
+    """
+    values, valid = self._values()
+    values = np.where(valid, values, np.nan)
+    with warnings.catch_warnings():
+      warnings.simplefilter('ignore', RuntimeWarning)
+      deviations = np.abs(values - np.nanmedian(values, axis=2, keepdims=True))
+      scale = 1.4826 * np.nanmedian(deviations, axis=2, keepdims=True)
+      return np.nanmedian(deviations / np.fmax(scale, min_scale), axis=0)[self._replicates]
+
+
+  def score_table(self, scores, mask=None):
+    """
+    A DataFrame with the group, sample, well, score and whether the well was excluded
+    (i.e. not in mask) for every configured well, from the scores given by well_scores()
+    """
+    if mask is None: mask = np.ones(self.n_configured, dtype=bool)
+    return pd.DataFrame({'group': [self.row_labels[x][0] for x in self.owners],
+                         'sample': [self.row_labels[x][1] for x in self.owners],
+                         'well': self.columns[:self.n_configured],
+                         'score': scores,
+                         'excluded': ~np.asarray(mask, dtype=bool)})
+
+
+  def well_curves(self):
+    """
+    The reading of each sample well at each time point, minus the mean of its group's blank,
+    in double precision
+
+    Returns (1) 2D array, time points x sample wells, (2) the position in self.labels of the
+    sample each well belongs to, and (3) the row of each well in self.od
+    """
+    sample_positions = np.full(len(self.bounds), -1)
+    sample_positions[self.sample_rows] = np.arange(len(self.sample_rows))
+    rows = np.flatnonzero(sample_positions[self.owners] >= 0)
+    owners = sample_positions[self.owners[rows]]
+    blank_means = np.where(self.blank_rows >= 0, self.means(dtype=np.float64)[:, self.blank_rows], 0)
+    return self.od[rows].astype(np.float64, copy=False).T - blank_means[:, owners], owners, rows
+
+
+def growth_parameters(time, od, window=5, min_od=0.01):
+  """
+  growth_parameters() derives growth parameters for many growth curves at once
+
+  All of the curves are handled together with array operations over the time x curve matrix:
+  - max_rate
+      maximum specific growth rate, the steepest slope of ln(OD) against time found by
+      fitting a line to each window of consecutive time points
+  - doubling_time
+      ln(2) / max_rate
+  - lag
+      lag time, where the line fitted at the maximum growth rate crosses the first ln(OD),
+      i.e. the tangent method. It is no earlier than the first time point.
+  - max_od
+      highest OD reading
+  - auc
+      area under the curve (trapezoidal rule). Missing readings are skipped, joining the
+      readings on either side of them.
+
+  Parameters are NaN for curves that never reach min_od or for which no slope could be fit.
+  Missing readings (NaN) are left out of all of them.
+
+  Positional Arguments:
+  (1) time points
+  (2) 2D array of OD readings, time points x curves
+
+  Key Word Arguments:
+  - window=5
+      Number of consecutive time points used for each log-OD slope
+
+  - min_od=0.01
+      Readings below this (or missing) are left out of the log-OD slopes
+
+  Returns a dictionary of 1D arrays, one value for each curve
+  """
+  time = np.asarray(time, dtype=float)
+  od = np.asarray(od, dtype=float)
+  if od.ndim == 1: od = od[:, np.newaxis]
+  window = int(window)
+  if window < 2: raise RuntimeError('The window must be at least 2 time points')
+  n_curves = od.shape[1]
+
+  with np.errstate(invalid='ignore', divide='ignore'):
+    max_od = np.nanmax(np.where(np.isnan(od), -np.inf, od), axis=0)
+    max_od[np.isinf(max_od)] = np.nan
+
+    # trapezoids from each reading back to the last reading before it that is not missing
+    present = ~np.isnan(od)
+    rows = np.arange(len(time))[:, np.newaxis]
+    last = np.maximum.accumulate(np.where(present, rows, -1), axis=0)
+    previous = np.concatenate([np.full((1, n_curves), -1), last[:-1]])
+    joined = present & (previous >= 0)
+    previous = np.maximum(previous, 0)
+    trapezoids = ((od + np.take_along_axis(od, previous, axis=0)) / 2) * (time[:, np.newaxis] - time[previous])
+    auc = np.where(joined, trapezoids, 0)[1:].sum(axis=0)
+    auc[~present.any(axis=0)] = np.nan
+
+    # least-squares slope of ln(OD) in every window, from running sums over the time axis
+    log_od = np.where(od >= min_od, np.log(np.where(od > 0, od, 1)), np.nan)
+    valid = ~np.isnan(log_od)
+    t = np.broadcast_to((time - time.mean())[:, np.newaxis], od.shape)
+    y = np.where(valid, log_od, 0)
+
+    def window_sums(values):
+      running = np.concatenate([np.zeros((1, n_curves)), np.cumsum(values, axis=0)])
+      return running[window:] - running[:-window]
+
+    counts = window_sums(valid.astype(float))
+    sum_t = window_sums(t)
+    sum_y = window_sums(y)
+    sum_tt = window_sums(t * t)
+    sum_ty = window_sums(t * y)
+    slopes = ((window * sum_ty) - (sum_t * sum_y)) / ((window * sum_tt) - (sum_t * sum_t))
+    slopes[counts < window] = np.nan
+
+  max_rate = np.full(n_curves, np.nan)
+  lag = np.full(n_curves, np.nan)
+  if slopes.shape[0] > 0:
+    fitted = ~np.isnan(slopes).all(axis=0)
+    best = np.argmax(np.where(np.isnan(slopes), -np.inf, slopes), axis=0)
+    columns = np.arange(n_curves)
+    max_rate = np.where(fitted, slopes[best, columns], np.nan)
+
+    # tangent at the steepest window, extended back to the first ln(OD)
+    first = np.argmax(valid, axis=0)
+    tangent_time = (sum_t[best, columns] / window) + time.mean()
+    tangent_log_od = sum_y[best, columns] / window
+    with np.errstate(invalid='ignore', divide='ignore'):
+      lag = tangent_time - ((tangent_log_od - log_od[first, columns]) / max_rate)
+    lag = np.where(fitted & (max_rate > 0), np.maximum(lag, time[0]), np.nan)
+
+  with np.errstate(invalid='ignore', divide='ignore'):
+    doubling_time = np.where(max_rate > 0, np.log(2) / max_rate, np.nan)
+
+  return {'lag': lag, 'max_rate': max_rate, 'doubling_time': doubling_time, 'max_od': max_od, 'auc': auc}
+
+
+# smoothing methods of smooth_curves() and downsampling methods of downsample_curves()
+SMOOTHING_METHODS = ('moving_average', 'savgol')
+DOWNSAMPLING_METHODS = ('lttb', 'minmax')
+
+
+def smooth_curves(values, method='moving_average', window=5, polyorder=2):
+  """
+  smooth_curves() smooths many growth curves at once
+
+  Every curve (column) of the time x curve matrix is smoothed in the same array operations:
+  - 'moving_average'
+      mean of the window of time points centered on each point, from running sums. Missing
+      readings are left out, and the window is cut short at the ends of the curves.
+  - 'savgol'
+      Savitzky-Golay filter: the value at each point of a polynomial of degree polyorder
+      fitted by least squares to the window centered on it. Keeps the height and shape of
+      peaks better than a moving average. The polynomials fitted to the first and last
+      windows give the points at the ends of the curves.
+
+  Positional Arguments:
+  (1) 2D array of OD readings, time points x curves (or a 1D array for one curve)
+
+  Key Word Arguments:
+  - method='moving_average'
+      One of SMOOTHING_METHODS
+
+  - window=5
+      Number of time points in each window. Must be odd.
+
+  - polyorder=2
+      Degree of the Savitzky-Golay polynomials, less than window
+
+  Returns an array of floats shaped like values
+  """
+  values = np.asarray(values, dtype=float)
+  one_curve = values.ndim == 1
+  if one_curve: values = values[:, np.newaxis]
+  window = int(window)
+  if (window < 1) or (window % 2 == 0): raise RuntimeError('The smoothing window must be an odd number of time points')
+  half = window // 2
+  n_points = values.shape[0]
+
+  if method == 'moving_average':
+    valid = ~np.isnan(values)
+    padding = ((half + 1, half), (0, 0))
+    running = np.cumsum(np.pad(np.where(valid, values, 0), padding), axis=0)
+    counts = np.cumsum(np.pad(valid.astype(float), padding), axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+      smoothed = (running[window:] - running[:-window]) / (counts[window:] - counts[:-window])
+
+  elif method == 'savgol':
+    if polyorder >= window: raise RuntimeError('The Savitzky-Golay polyorder must be less than the window')
+    if n_points < window: raise RuntimeError('The smoothing window is longer than the curves (%s time points)' % n_points)
+    offsets = np.arange(-half, half + 1)
+    fit = np.linalg.pinv(np.vander(offsets, polyorder + 1, increasing=True))
+    smoothed = np.empty_like(values)
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+    smoothed[half:n_points - half] = windows @ fit[0]
+    smoothed[:half] = np.vander(offsets[:half], polyorder + 1, increasing=True) @ (fit @ values[:window])
+    smoothed[n_points - half:] = np.vander(offsets[half + 1:], polyorder + 1, increasing=True) @ (fit @ values[-window:])
+
+  else:
+    raise RuntimeError('Smoothing method not a valid value: %s' % ', '.join(SMOOTHING_METHODS))
+
+  return smoothed[:, 0] if one_curve else smoothed
+
+
+def downsample_curves(time, values, points=1000, method='lttb'):
+  """
+  downsample_curves() picks the readings to keep when many growth curves are reduced to
+  about the given number of time points, keeping their shapes
+
+  - 'lttb'
+      Largest-Triangle-Three-Buckets: the time points are split into buckets, and from each
+      bucket the time point is kept that makes the largest triangle with the point kept
+      from the previous bucket and the mean of the next bucket. The areas of all of the
+      curves are added up, so the same time points are kept for every curve. The first and
+      last time points are always kept.
+  - 'minmax'
+      The lowest and highest reading of each curve in each of points / 2 buckets, in the
+      order they were read. Peaks and dips are never lost, but each is drawn at the first or
+      last time of its bucket.
+
+  Positional Arguments:
+  (1) time points
+  (2) 2D array of OD readings, time points x curves
+
+  Key Word Arguments:
+  - points=1000
+      Number of time points to keep
+
+  - method='lttb'
+      One of DOWNSAMPLING_METHODS
+
+  Returns the new time points, and a 2D array of row numbers (new time points x curves)
+  saying which reading of each curve to take, e.g. with numpy.take_along_axis. Curves
+  with no more than the given number of time points are kept as they are.
+  """
+  time = np.asarray(time, dtype=float)
+  values = np.asarray(values, dtype=float)
+  n_points, n_curves = values.shape
+  points = int(points)
+  if method not in DOWNSAMPLING_METHODS:
+    raise RuntimeError('Downsampling method not a valid value: %s' % ', '.join(DOWNSAMPLING_METHODS))
+  if points < 3: raise RuntimeError('At least 3 time points must be kept when downsampling')
+  if n_points <= points:
+    return time, np.broadcast_to(np.arange(n_points)[:, np.newaxis], (n_points, n_curves))
+
+  if method == 'minmax':
+    edges = np.linspace(0, n_points, (points // 2) + 1).astype(int)
+    starts, ends = edges[:-1], edges[1:]
+    filled = np.where(np.isnan(values), np.nanmean(values, axis=0), values)
+    lowest = np.minimum.reduceat(filled, starts, axis=0)
+    highest = np.maximum.reduceat(filled, starts, axis=0)
+    bucket = np.repeat(np.arange(len(starts)), ends - starts)
+    rows = np.arange(n_points)[:, np.newaxis]
+    # last row of each bucket holding its lowest (highest) value, for every curve
+    low_rows = np.maximum.reduceat(np.where(filled == lowest[bucket], rows, -1), starts, axis=0)
+    high_rows = np.maximum.reduceat(np.where(filled == highest[bucket], rows, -1), starts, axis=0)
+    indexes = np.empty((2 * len(starts), n_curves), dtype=np.intp)
+    indexes[0::2] = np.minimum(low_rows, high_rows)
+    indexes[1::2] = np.maximum(low_rows, high_rows)
+    new_time = np.empty(2 * len(starts))
+    new_time[0::2] = time[starts]
+    new_time[1::2] = time[ends - 1]
+    return new_time, indexes
+
+  # lttb. Buckets are worked through in order, each one for all of the curves at once
+  filled = np.where(np.isnan(values), 0, values)
+  edges = np.floor(np.linspace(1, n_points - 1, points - 1)).astype(int)
+  kept = np.empty(points, dtype=np.intp)
+  kept[0] = 0
+  kept[-1] = n_points - 1
+  for i in range(points - 2):
+    start, end = edges[i], edges[i + 1]
+    next_end = edges[i + 2] if i + 3 < points else n_points
+    next_time = time[end:next_end].mean()
+    next_values = filled[end:next_end].mean(axis=0)
+    previous = kept[i]
+    areas = np.abs(((time[previous] - next_time) * (filled[start:end] - filled[previous]))
+                   - ((time[previous] - time[start:end, np.newaxis]) * (next_values - filled[previous]))).sum(axis=1)
+    kept[i + 1] = start + np.argmax(areas)
+  return time[kept], np.broadcast_to(kept[:, np.newaxis], (points, n_curves))
+
+
+def merge_experiments(experiments, time_grid=None, span='overlap', reference=None, normalize='max'):
+  """
+  merge_experiments() combines the summaries of many runs (e.g. the same strains grown on
+  several plates or days) into one set of curves
+
+  Every run is resampled onto a common time grid by linear interpolation, all of its curves
+  at once, and matching group__sample columns are lined up by name. The mean, standard
+  deviation and standard error across runs are kept as running totals as each run is
+  added, so hundreds of runs are merged without joining tables or holding every resampled
+  run in memory.
+
+  Positional Arguments:
+  (1) list of Experiments (summarized or loaded with load_summary) or of summary files.
+      Their time points must be in the same unit.
+
+  Key Word Arguments:
+  - time_grid=None
+      Time points to resample onto. Defaults to the time points of the runs, if they are all
+      the same, or else to evenly spaced time points, as far apart as the median interval of
+      the runs, over the span of the runs
+  - span='overlap'
+      For the default time grid: 'overlap' covers only the times that every run covers;
+      'union' covers all of the runs, and runs count only over the times they cover.
+      Runs are never extrapolated.
+  - reference=None
+      A reference strain to normalize each run to before merging: a sample name, to use
+      the sample of that name in each group, or a group__sample, to use one curve for
+      every group. Curves whose reference is missing from their run are left out.
+  - normalize='max'
+      How curves are normalized to the reference: 'max' divides each curve by the highest
+      OD of its reference in the same run, so that plate-to-plate differences in yield are
+      removed; 'ratio' divides it by the reference at each time point.
+
+  Returns an Experiment with
+  - summary_data, the mean across runs of each group__sample at each time point
+  - summary_sd and summary_sem, the standard deviation and error across runs
+  - run_counts, the number of runs with a value at each time point
+  - metadata['runs'], the data (or summary) file of each run
+  """
+  if normalize not in ('max', 'ratio'): raise RuntimeError('normalize argument not a valid value: max or ratio')
+  if span not in ('overlap', 'union'): raise RuntimeError('span argument not a valid value: overlap or union')
+  runs = []
+  for expt in experiments:
+    if isinstance(expt, (str, os.PathLike)):
+      summary_path = os.fspath(expt)
+      expt = Experiment()
+      expt.load_summary(summary_path)
+    if expt.summary_data is None: raise RuntimeError('Experiments must be summarized before they are merged')
+    runs.append(expt)
+  if not runs: raise RuntimeError('No experiments to merge')
+
+  # curves of each run, and the time points each covers
+  times = [np.asarray(x.summary_data['Time'], dtype=float) for x in runs]
+  for run_time in times:
+    if (len(run_time) < 2) or np.any(np.diff(run_time) < 0):
+      raise RuntimeError('Runs must have at least 2 time points, in increasing order, to be merged')
+  if (time_grid is None) and all([np.array_equal(x, times[0]) for x in times[1:]]):
+    time_grid = times[0]
+  elif time_grid is None:
+    starts = [x[0] for x in times]
+    ends = [x[-1] for x in times]
+    start, end = (max(starts), min(ends)) if span == 'overlap' else (min(starts), max(ends))
+    if end < start: raise RuntimeError('The runs do not overlap in time. Use span="union" or give a time_grid')
+    step = np.median([np.median(np.diff(x)) for x in times])
+    if step <= 0: step = end - start
+    time_grid = start + (np.arange(int(np.floor((end - start) / step + 1e-9)) + 1) * step)
+  time_grid = np.asarray(time_grid, dtype=float)
+
+  column_numbers = {}
+  for expt in runs:
+    for label in expt.summary_data.columns:
+      if label != 'Time': column_numbers.setdefault(label, len(column_numbers))
+  labels = list(column_numbers)
+  shape = (len(time_grid), len(labels))
+  counts = np.zeros(shape)
+  means = np.zeros(shape)
+  squares = np.zeros(shape)
+
+  for expt, run_time in zip(runs, times):
+    run_labels = [x for x in expt.summary_data.columns if x != 'Time']
+    values = expt.summary_data[run_labels].to_numpy(dtype=float)
+    resampled = _interpolate(run_time, values, time_grid)
+    if reference is not None:
+      resampled = _normalize_run(resampled, values, run_labels, reference, normalize, expt)
+
+    # running mean and sum of squared differences (Welford), for all of this run's curves at once
+    columns = np.array([column_numbers[x] for x in run_labels], dtype=np.intp)
+    valid = ~np.isnan(resampled)
+    run_counts = counts[:, columns] + valid
+    difference = np.where(valid, resampled - means[:, columns], 0)
+    run_means = means[:, columns] + (difference / np.maximum(run_counts, 1))
+    squares[:, columns] += difference * np.where(valid, resampled - run_means, 0)
+    means[:, columns] = run_means
+    counts[:, columns] = run_counts
+
+  merged = Experiment()
+  with np.errstate(invalid='ignore', divide='ignore'):
+    means[counts == 0] = np.nan
+    sd = np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
+    sem = sd / np.sqrt(counts)
+  merged.timepoints = time_grid.tolist()
+  merged.summary_data = _summary_frame(merged.timepoints, means, labels)
+  merged.summary_sd = _summary_frame(merged.timepoints, sd, labels)
+  merged.summary_sem = _summary_frame(merged.timepoints, sem, labels)
+  merged.run_counts = _summary_frame(merged.timepoints, counts.astype(int), labels)
+  merged.metadata = {'runs': [x.data_path or x.summary_path for x in runs]}
+  return merged
+
+
+def _interpolate(time, values, time_grid):
+  """
+  Linear interpolation of every column of values (time points x curves) at the times in
+  time_grid, NaN outside of the times of the run
+  """
+  right = np.clip(np.searchsorted(time, time_grid, side='right'), 1, len(time) - 1)
+  left = right - 1
+  interval = time[right] - time[left]
+  with np.errstate(invalid='ignore', divide='ignore'):
+    weight = np.where(interval > 0, (time_grid - time[left]) / interval, 0)[:, np.newaxis]
+  resampled = (values[left] * (1 - weight)) + (values[right] * weight)
+  resampled[(time_grid < time[0]) | (time_grid > time[-1])] = np.nan
+  return resampled
+
+
+def _normalize_run(resampled, values, labels, reference, normalize, expt):
+  """ Normalize the resampled curves of one run to its reference curves, see merge_experiments() """
+  positions = {x: i for i, x in enumerate(labels)}
+  if '__' in reference:
+    reference_columns = np.array([positions.get(reference, -1)] * len(labels))
+  else:
+    reference_columns = np.array([positions.get(x.split('__', 1)[0] + '__' + reference, -1) for x in labels])
+  missing = reference_columns < 0
+  if missing.any():
+    print('Warning. Reference %s not found for %s of %s. They are left out of the merge'
+      % (reference, ', '.join(sorted(set([labels[i].split('__', 1)[0] for i in np.flatnonzero(missing)]))),
+         expt.data_path or expt.summary_path))
+  with np.errstate(invalid='ignore', divide='ignore'):
+    if normalize == 'max':
+      scale = np.nanmax(np.where(np.isnan(values), -np.inf, values), axis=0)[reference_columns]
+    else:
+      scale = resampled[:, reference_columns]
+    normalized = resampled / np.where(scale > 0, scale, np.nan)
+  normalized[:, missing] = np.nan
+  return normalized
+
+
+def _processing_kwargs(argument, name, first_key):
+  """
+  Key word arguments for smooth_curves() or downsample_curves() from a smoothing or
+  downsample argument: a dictionary of them, or the value of the first key word argument
+  """
+  if (argument is False) or (argument is None): return None
+  if isinstance(argument, dict): return dict(argument)
+  if isinstance(argument, (bool, list, tuple)):
+    raise RuntimeError('The %s argument must be a dictionary of key word arguments or a value for %s' % (name, first_key))
+  return {first_key: argument}
+
+
+def _well_positions(wells, column_positions):
+  """
+  Positions of the given wells in the data columns, in the order given, without duplicates
+  """
+  positions = []
+  for well in wells:
+    position = column_positions.get(str(well))
+    if (position is not None) and (position not in positions): positions.append(position)
+  return positions
+
+
+# file name endings of the outputs of process_runs(), which the watch command does not process
+OUTPUT_SUFFIXES = ('.summary.csv', '.parameters.csv', '.summary' + SUMMARY_EXTENSION)
+
+# axis labels for the time units
+TIME_LABELS = {'minutes': 'Time (min)', 'hours': 'Time (h)', 'days': 'Time (d)'}
+
+
+def main(argv=None):
+  """
+  Command line interface, e.g.
+
+  python3 bioscreen.py summarize data.csv --config data.config
+  python3 bioscreen.py graph-groups *.csv --config data.config --jobs 4 --output-dir figures
+  python3 bioscreen.py params data.csv --config data.config --per well
+  python3 bioscreen.py graph data.summary.csv
+  python3 bioscreen.py report data.csv --config data.config --parameters sample
+  python3 bioscreen.py watch drop_directory --config data.config --graph-groups
+
+  Use python3 bioscreen.py COMMAND --help for the options of each command.
+  Returns the exit status: 0 if every file was processed, 1 otherwise.
+  """
+  import argparse
+
+  common = argparse.ArgumentParser(add_help=False)
+  common.add_argument('-c', '--config', help='configuration file (see Experiment.set_config_from_file)')
+  common.add_argument('-t', '--timepoints', default='hours', help='time unit: minutes, hours or days (default hours)')
+  common.add_argument('-r', '--reader', default='pandas', choices=sorted(READERS), help='data file reader (default pandas)')
+  common.add_argument('--encoding', default='utf_16_le', help='data file encoding (default utf_16_le)')
+  common.add_argument('--rows-to-skip', type=int, default=2, help='rows above the column headers (default 2)')
+  common.add_argument('--sep', default=',', help="data file separator, '\\s+' for .txt files (default ,)")
+  common.add_argument('--cache', help='directory of an ExportCache for parsed data files')
+  common.add_argument('--exclude-outliers', action='store_true', help='leave outlier wells out of the means')
+  common.add_argument('-j', '--jobs', type=int, default=1, help='number of files to process at once (default 1)')
+  common.add_argument('-o', '--output-dir', help='directory for outputs (default: next to each data file)')
+
+  graphing = argparse.ArgumentParser(add_help=False)
+  graphing.add_argument('--title', default=False, help='figure title')
+  graphing.add_argument('--xlabel', help='x axis label (default from the time unit)')
+  graphing.add_argument('--ylabel', default='OD600', help='y axis label (default OD600)')
+  graphing.add_argument('--error-bands', default=False, choices=['sd', 'sem'], help='shade the SD or SEM of each sample')
+  graphing.add_argument('--smoothing', default=False, choices=SMOOTHING_METHODS, help='smooth the curves before graphing')
+  graphing.add_argument('--max-points', type=int, default=False,
+    help='graph at most this many time points of each curve, without markers (LTTB downsampling)')
+
+  parameters = argparse.ArgumentParser(add_help=False)
+  parameters.add_argument('--per', default='sample', choices=['sample', 'well', 'curve'],
+    help='growth parameters for each sample, well or summary curve (default sample)')
+  parameters.add_argument('--window', type=int, default=5, help='time points per log-OD slope (default 5)')
+  parameters.add_argument('--min-od', type=float, default=0.01, help='lowest OD used for slopes (default 0.01)')
+
+  parser = argparse.ArgumentParser(prog='bioscreen', description='Summarize and graph Bioscreen C growth experiments')
+  commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+  commands.required = True
+  summarize = commands.add_parser('summarize', parents=[common], help='write a summary of each data file')
+  summarize.add_argument('--format', default='text', choices=['text', 'binary'], help='summary file format (default text)')
+  graph = commands.add_parser('graph', parents=[common, graphing],
+    help='graph each data file (or summary file, when there is no --config)')
+  graph_groups = commands.add_parser('graph-groups', parents=[common, graphing],
+    help='graph each group of each data file (or summary file, when there is no --config)')
+  graph_groups.add_argument('--pdf', action='store_true', help='one PDF with a page for each group')
+  commands.add_parser('params', parents=[common, parameters], help='write the growth parameters of each data file')
+  report = commands.add_parser('report', parents=[common, graphing],
+    help='write an interactive HTML report of each data file (or summary file, when there is no --config)')
+  report.add_argument('--parameters', default=False, choices=['sample', 'well', 'curve'],
+    help='add a table of the growth parameters of each sample, well or summary curve')
+  watch = commands.add_parser('watch', parents=[common, graphing, parameters],
+    help='process new data files as they appear in a directory')
+  watch.add_argument('--format', default='text', choices=['text', 'binary'], help='summary file format (default text)')
+  watch.add_argument('--graph', action='store_true', help='graph each new data file')
+  watch.add_argument('--graph-groups', action='store_true', help='graph each group of each new data file')
+  watch.add_argument('--params', action='store_true', help='write the growth parameters of each new data file')
+  watch.add_argument('--pattern', action='append', help='file name patterns to watch for (default *.csv and *.txt)')
+  watch.add_argument('--interval', type=float, default=30, help='seconds between checks (default 30)')
+  watch.add_argument('--once', action='store_true', help='process the files that are there now, then stop')
+  for command in (summarize, graph, graph_groups, commands.choices['params'], report):
+    command.add_argument('files', nargs='+', help='data files')
+  watch.add_argument('directory', help='directory to watch')
+
+  args = parser.parse_args(argv)
+
+  # graphs of summary files
+  if (args.command in ('graph', 'graph-groups', 'report')) and (args.config is None):
+    return _graph_summaries(args)
+  if args.config is None: parser.error('the --config argument is required')
+
+  options = _cli_options(args)
+  if args.command == 'watch':
+    return _watch(args, options)
+  return _report_manifest(process_runs(args.files, args.config, workers=args.jobs, **options))
+
+
+def _cli_options(args):
+  """ process_runs() key word arguments for the command line arguments """
+  summarize_kwargs = {'timepoints': args.timepoints, 'reader': args.reader, 'input_encoding': args.encoding,
+                      'rows_to_skip': args.rows_to_skip, 'sep': args.sep, 'cache': args.cache,
+                      'exclude_outliers': args.exclude_outliers}
+  options = {'output_dir': args.output_dir, 'summarize_kwargs': summarize_kwargs, 'write_summary': False,
+             'graph': False, 'graph_groups': False, 'parameters': False}
+  if args.command in ('summarize', 'watch'):
+    options['write_summary'] = args.format
+  if args.command == 'graph' or (args.command == 'watch' and args.graph):
+    options['graph'] = True
+  if args.command == 'graph-groups' or (args.command == 'watch' and args.graph_groups):
+    options['graph_groups'] = 'pdf' if getattr(args, 'pdf', False) else True
+  if args.command == 'params' or (args.command == 'watch' and args.params):
+    options['parameters'] = args.per
+    options['parameters_kwargs'] = {'window': args.window, 'min_od': args.min_od}
+  if options['graph'] or options['graph_groups']:
+    options['graph_kwargs'] = _cli_graph_kwargs(args)
+  if args.command == 'report':
+    options['report'] = True
+    options['report_kwargs'] = _cli_report_kwargs(args)
+  return options
+
+
+def _cli_graph_kwargs(args):
+  """ Experiment.graph() key word arguments for the command line arguments """
+  xlabel = args.xlabel
+  if xlabel is None: xlabel = TIME_LABELS.get(TIME_UNITS.get(args.timepoints.lower()), 'Time')
+  graph_kwargs = {'title': args.title, 'xlabel': xlabel, 'ylabel': args.ylabel, 'error_bands': args.error_bands,
+                  'smoothing': args.smoothing, 'downsample': args.max_points}
+  if args.max_points: graph_kwargs['marker'] = None
+  return graph_kwargs
+
+
+def _cli_report_kwargs(args):
+  """ Experiment.write_report() key word arguments for the command line arguments """
+  report_kwargs = _cli_graph_kwargs(args)
+  report_kwargs.pop('marker', None)
+  report_kwargs['parameters'] = args.parameters
+  return report_kwargs
+
+
+def _graph_summaries(args):
+  """ The graph, graph-groups and report commands for summary files """
+  status = 0
+  for summary_path in args.files:
+    try:
+      expt = Experiment()
+      expt.load_summary(summary_path)
+      output_dir = args.output_dir or os.path.dirname(summary_path)
+      # data.summary.csv gives data.png, as named by process_runs()
+      name = os.path.splitext(os.path.basename(summary_path))[0]
+      if name.endswith('.summary'): name = name[:-len('.summary')]
+      output_base = os.path.join(output_dir, name)
+      if args.command == 'graph':
+        expt.graph(output_base + '.png', **_cli_graph_kwargs(args))
+        print(output_base + '.png')
+      elif args.command == 'report':
+        expt.write_report(output_base + '.html', **_cli_report_kwargs(args))
+        print(output_base + '.html')
+      else:
+        for file_name in expt.graph_groups(output_base, pdf=args.pdf, **_cli_graph_kwargs(args)): print(file_name)
+    except Exception as error:
+      print('Error. %s: %s: %s' % (summary_path, type(error).__name__, error), file=sys.stderr)
+      status = 1
+  return status
+
+
+def _report_manifest(manifest):
+  """ Print the outputs and errors in a process_runs() manifest. Returns the exit status """
+  status = 0
+  for record in manifest:
+    if record['error'] is not None:
+      print('Error. %s: %s' % (record['data_path'], record['error']), file=sys.stderr)
+      status = 1
+      continue
+    for output in [record['summary_path'], record['parameters_path']] + record['figures'] + [record['report_path']]:
+      if output is not None: print(output)
+  return status
+
+
+def _watch(args, options):
+  """
+  The watch command: check a directory for new data files every interval seconds and process
+  them once they have stopped growing (the same size at two checks in a row)
+  """
+  patterns = args.pattern or ['*.csv', '*.txt']
+  sizes = {}
+  processed = set()
+  status = 0
+  try:
+    while True:
+      data_paths = set()
+      for pattern in patterns: data_paths.update(glob.glob(os.path.join(args.directory, pattern)))
+      ready = []
+      for data_path in sorted(data_paths):
+        if (data_path in processed) or data_path.endswith(OUTPUT_SUFFIXES): continue
+        size = os.path.getsize(data_path)
+        if args.once or (sizes.get(data_path) == size): ready.append(data_path)
+        sizes[data_path] = size
+      if ready:
+        status = max(status, _report_manifest(process_runs(ready, args.config, workers=args.jobs, **options)))
+        processed.update(ready)
+      sys.stdout.flush()
+      if args.once: break
+      time.sleep(args.interval)
+  except KeyboardInterrupt:
+    pass
+  return status
+
+
+# plate layouts: number of plates, and the rows and columns of each plate. Wells are numbered
+# plate by plate, and down each column ('column') or along each row ('row') within a plate.
+PLATE_LAYOUTS = {'honeycomb': {'plates': 2, 'rows': 10, 'columns': 10, 'order': 'column'},
+                 'honeycomb100': {'plates': 1, 'rows': 10, 'columns': 10, 'order': 'column'},
+                 '96': {'plates': 1, 'rows': 8, 'columns': 12, 'order': 'row'}}
+
+
+class PlateConfiguration:
+
+  def __init__(self, configuration, layout='honeycomb'):
+    """
+    A PlateConfiguration is a compiled, frozen experiment configuration. It is hashable, so it
+    can be compared and cached, and it compiles itself into the WellIndex that summarize()
+    uses (once for each set of data columns, see well_index).
+
+    It can be read like the configuration list from set_config(): iterating over it (or
+    indexing it) gives a read-only mapping for each group, {'group': group, sample: (wells), ...}
+    with the wells of each sample as a tuple. To change a configuration, edit the plain list
+    from to_list() and compile it again.
+
+    Checks made when it is created:
+    - each well number is within the plate layout
+    - no well is in more than one sample, or in both a sample and a blank (a blank may be
+      shared by groups)
+    - each group and sample is only defined once
+
+    Positional Arguments:
+    (1) configuration list, as from set_config(), or a PlateConfiguration
+
+    Key Word Arguments:
+    - layout='honeycomb'
+        Plate layout, a key of PLATE_LAYOUTS
+    """
+    if layout not in PLATE_LAYOUTS:
+      raise RuntimeError('Plate layout not a valid value: %s' % ', '.join(PLATE_LAYOUTS))
+    self.layout = layout
+    plate = PLATE_LAYOUTS[layout]
+    n_wells = plate['plates'] * plate['rows'] * plate['columns']
+
+    groups = []
+    sample_wells = {}    # well: group__sample, to find wells used twice
+    blank_wells = {}     # well: group, as blanks may be shared but not also used as samples
+    for group in configuration:
+      if 'group' not in group: raise RuntimeError('Configuration group has no "group" name: %s' % group)
+      group_name = str(group['group'])
+      if group_name in [x[0] for x in groups]: raise RuntimeError('Group %s is configured twice' % group_name)
+      samples = []
+      for sample, wells in list(group.items()):
+        if sample == 'group': continue
+        wells = tuple([int(x) for x in wells])
+        for well in wells:
+          if (well < 1) or (well > n_wells):
+            raise RuntimeError('Well %s of %s__%s is not on the %s plate layout (wells 1-%s)'
+              % (well, group_name, sample, layout, n_wells))
+          if sample == 'blank':
+            if well in sample_wells:
+              raise RuntimeError('Well %s is in both %s and %s__blank' % (well, sample_wells[well], group_name))
+            blank_wells.setdefault(well, group_name)
+            continue
+          if well in sample_wells:
+            raise RuntimeError('Well %s is in both %s and %s__%s' % (well, sample_wells[well], group_name, sample))
+          if well in blank_wells:
+            raise RuntimeError('Well %s is in both %s__blank and %s__%s' % (well, blank_wells[well], group_name, sample))
+          sample_wells[well] = '%s__%s' % (group_name, sample)
+        samples.append((str(sample), wells))
+      groups.append((group_name, tuple(samples)))
+    self._groups = tuple(groups)
+    self._well_indexes = {}
+    self._hash = hash((self.layout, self._groups))
+
+
+  def __iter__(self):
+    for i in range(len(self._groups)): yield self[i]
+
+
+  def __len__(self):
+    return len(self._groups)
+
+
+  def __getitem__(self, i):
+    if isinstance(i, slice): return [self[x] for x in range(len(self._groups))[i]]
+    group_name, samples = self._groups[i]
+    group = {'group': group_name}
+    group.update(samples)
+    return types.MappingProxyType(group)
+
+
+  def __eq__(self, other):
+    return isinstance(other, PlateConfiguration) and (self.layout == other.layout) and (self._groups == other._groups)
+
+
+  def __hash__(self):
+    return self._hash
+
+
+  def __setattr__(self, name, value):
+    if hasattr(self, '_hash'): raise AttributeError('PlateConfiguration is frozen')
+    object.__setattr__(self, name, value)
+
+
+  def __reduce__(self):
+    return (PlateConfiguration, (self.to_list(), self.layout))
+
+
+  def __repr__(self):
+    return repr(self.to_list())
+
+
+  @property
+  def groups(self):
+    """ The group names, in order """
+    return [x[0] for x in self._groups]
+
+
+  @property
+  def wells(self):
+    """ All of the configured well numbers, sorted """
+    return sorted(set([well for group, samples in self._groups for sample, wells in samples for well in wells]))
+
+
+  def to_list(self):
+    """ The configuration as a new, editable list of dictionaries, as from set_config() """
+    configuration = []
+    for group_name, samples in self._groups:
+      group = {'group': group_name}
+      for sample, wells in samples: group[sample] = list(wells)
+      configuration.append(group)
+    return configuration
+
+
+  def validate(self, columns):
+    """
+    Check that every configured well is a column of the data. Raises a RuntimeError if not.
+
+    Positional Arguments:
+    (1) column names of the data (e.g. BioscreenExport.columns)
+    """
+    present = set([str(x) for x in columns])
+    missing = [x for x in self.wells if str(x) not in present]
+    if missing:
+      raise RuntimeError('Configured wells are not in the data: %s' % _well_notation(missing))
+
+
+  def well_index(self, columns):
+    """
+    The WellIndex of this configuration for the given data columns, after validate().
+    Each is compiled once and reused.
+    """
+    columns = tuple([str(x) for x in columns])
+    if columns not in self._well_indexes:
+      self.validate(columns)
+      self._well_indexes[columns] = WellIndex(self, columns)
+    return self._well_indexes[columns]
+
+
+def compile_configuration(config, layout='honeycomb'):
+  """
+  compile_configuration() turns any form of experiment configuration into a PlateConfiguration
+
+  Positional Arguments:
+  (1) one of
+      - a configuration list, as from set_config(), or a PlateConfiguration
+      - a configuration file: tab-delimited lines of group, sample and wells
+        (see Experiment.set_config_from_file). Wells are a list of well numbers and ranges,
+        e.g. 1-4,9 (see parse_wells)
+      - a plate map: a grid (comma or tab-delimited) laid out like the plate, in which each
+        cell is the group__sample in that well (sample "blank", in lower case, for blanks)
+        or empty.
+        Plates of a multi-plate layout are separated by an empty line.
+        Plate maps are recognized by having cells with "__" in them.
+
+  Key Word Arguments:
+  - layout='honeycomb'
+      Plate layout, a key of PLATE_LAYOUTS. The honeycomb layout is the two 100-well
+      plates of the Bioscreen C (wells 1-200), numbered down each column.
+
+  Lines starting with "#" are ignored in files.
+  """
+  if isinstance(config, PlateConfiguration):
+    if config.layout == layout: return config
+    return PlateConfiguration(config.to_list(), layout=layout)
+  if not isinstance(config, (str, os.PathLike)):
+    return PlateConfiguration(config, layout=layout)
+
+  config = os.fspath(config)
+  with open(config, 'r') as config_file:
+    lines = [x.rstrip('\r\n') for x in config_file if not x.startswith('#')]
+  if any(['__' in x for x in lines]):
+    return _compile_plate_map(lines, layout)
+
+  groups = []
+  group_config = {} # keys = group name, values are dictionary with keys=sample, values=[wells]
+  for line_number, line in enumerate(lines, 1):
+    if not line.strip(): continue
+    ls = line.split('\t')
+    if len(ls) != 3:
+      raise RuntimeError('Error in configuration file format on line {}: {}'.format(line_number, line))
+    group = rename_strict(ls[0])
+    if group.lower() == 'blank': group = 'blank'
+    sample = rename_strict(ls[1])
+    try:
+      wells = parse_wells(ls[2], layout=layout)
+    except RuntimeError as error:
+      raise RuntimeError('Error in configuration file on line {}: {}'.format(line_number, error))
+    if group not in groups: groups.append(group)
+    group_config.setdefault(group, {})
+    if sample in group_config[group]:
+      raise RuntimeError('Sample %s of group %s is on more than one line of the configuration file' % (sample, group))
+    group_config[group][sample] = wells
+
+  configuration = []
+  for group in groups:
+    new_group = {'group': group}
+    new_group.update(group_config[group])
+    configuration.append(new_group)
+  return PlateConfiguration(configuration, layout=layout)
+
+
+def _compile_plate_map(lines, layout):
+  """ compile_configuration() for plate maps """
+  plate = PLATE_LAYOUTS[layout]
+  sep = '\t' if any(['\t' in x for x in lines]) else ','
+
+  # split into plates at empty lines
+  plates = [[]]
+  for line in lines:
+    if line.strip(): plates[-1].append([x.strip().strip('"') for x in line.split(sep)])
+    elif plates[-1]: plates.append([])
+  plates = [x for x in plates if x]
+  if len(plates) > plate['plates']:
+    raise RuntimeError('Plate map has %s plates, the %s layout has %s' % (len(plates), layout, plate['plates']))
+
+  groups = []
+  group_config = {}
+  for plate_number, grid in enumerate(plates):
+    if (len(grid) > plate['rows']) or (max([len(x) for x in grid]) > plate['columns']):
+      raise RuntimeError('Plate map is larger than the %s x %s plates of the %s layout' % (plate['rows'], plate['columns'], layout))
+    for row, cells in enumerate(grid):
+      for column, cell in enumerate(cells):
+        if not cell: continue
+        if '__' not in cell: raise RuntimeError('Plate map cell is not group__sample: %s' % cell)
+        group, sample = [rename_strict(x) for x in cell.split('__', 1)]
+        if group not in groups: groups.append(group)
+        group_config.setdefault(group, {}).setdefault(sample, []).append(
+          _well_number(plate_number, row, column, plate))
+
+  configuration = []
+  for group in groups:
+    new_group = {'group': group}
+    for sample, wells in group_config[group].items(): new_group[sample] = sorted(wells)
+    configuration.append(new_group)
+  return PlateConfiguration(configuration, layout=layout)
+
+
+def _well_number(plate_number, row, column, plate):
+  """ Well number from the plate, row and column (all counted from 0) on a plate layout """
+  if plate['order'] == 'column':
+    position = (column * plate['rows']) + row
+  else:
+    position = (row * plate['columns']) + column
+  return (plate_number * plate['rows'] * plate['columns']) + position + 1
+
+
+def parse_wells(notation, layout='honeycomb'):
+  """
+  parse_wells() turns well notation into a list of well numbers
+
+  Notation is a comma-separated list of wells and ranges of wells, e.g. '1-4', '1,2,3,4' or
+  '1-4,9,11-12'. On layouts with lettered rows (96 well plates) wells can also be given by
+  row and column, e.g. 'A1-A4,B1'.
+
+  Key Word Arguments:
+  - layout='honeycomb'
+      Plate layout, a key of PLATE_LAYOUTS
+  """
+  plate = PLATE_LAYOUTS[layout]
+  wells = []
+  for part in notation.split(','):
+    part = part.strip()
+    if not part: continue
+    ends = [x.strip() for x in part.split('-')]
+    if len(ends) > 2: raise RuntimeError('Unable to understand the wells: %s' % notation)
+    numbers = []
+    for end in ends:
+      if end.isdigit():
+        numbers.append(int(end))
+      elif (plate['order'] == 'row') and re.match('^[A-Za-z][0-9]+$', end):
+        row = ord(end[0].upper()) - ord('A')
+        column = int(end[1:]) - 1
+        if (row >= plate['rows']) or (column < 0) or (column >= plate['columns']):
+          raise RuntimeError('Well %s is not on the %s plate layout' % (end, layout))
+        numbers.append(_well_number(0, row, column, plate))
+      else:
+        raise RuntimeError('Unable to understand the wells: %s' % notation)
+    if numbers[-1] < numbers[0]: raise RuntimeError('Well range goes backwards: %s' % part)
+    wells.extend(w(numbers[0], numbers[-1]))
+  if not wells: raise RuntimeError('No wells given')
+  return wells
+
+
+def _well_notation(wells):
+  """ Short notation for a sorted list of well numbers, e.g. [1, 2, 3, 5] gives '1-3,5' """
+  ranges = []
+  for well in wells:
+    if ranges and (well == ranges[-1][1] + 1): ranges[-1][1] = well
+    else: ranges.append([well, well])
+  return ','.join([str(a) if a == b else '%s-%s' % (a, b) for a, b in ranges])
+
+
+def w(a, b):
+  """
+  w() will return a list of consecutive integers from a to b
+  it is equivalent to list(range(a,b+1,1))
+  """
+  return list(range(a, b+1))
+
+
+def rename_strict(file_name):
+  """ 
+  rename_strict takes a file name (or just a string) and replaces all unwanted characters with
+  an underscore, then shortens the name so that there aren't two or more underscores
+  in a row
+
+  Allowed characters = A-Z, a-z, 0-9, _, -, ., /
+  """
+  scrubbed_name = re.sub('[^A-Za-z0-9_\-./]', '_', file_name.strip())
+  rm_underscores = scrubbed_name.strip('_')
+  while '__' in rm_underscores: rm_underscores = re.sub('__', '_', rm_underscores)
+  return rm_underscores
+
+
+if __name__ == '__main__':
+  sys.exit(main())